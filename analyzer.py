@@ -3,52 +3,83 @@
 
 모듈 구조:
 ├── yahoo_client.py  # 야후 파이낸스 API
+├── data_quality.py  # 시세 데이터 검사/보정
+├── panel.py         # 여러 종목 지표 행렬 계산
+├── indicator_cache.py  # 지표 계산 결과 디스크 캐시
 ├── indicators.py    # 기술적 지표 (MA, RSI, MACD, 볼린저, 일목균형표)
 ├── bitgak.py        # 빗각투자 지표 (VWAP, CSI, HVN)
 ├── strategy.py      # 매매 전략 생성
 └── portfolio.py     # 포트폴리오 관리, 리포트 저장
 """
 
+import asyncio
+import copy
 import pandas as pd
 from datetime import datetime
 
 # 모듈 import
 from yahoo_client import (
-    get_stock_data, get_fundamentals, get_market_indicators,
-    get_underlying, is_leveraged, LEVERAGE_MAP,
-    get_exchange_rate, get_current_price
+    get_stock_data, get_bulk_stock_data, get_fundamentals, get_market_indicators,
+    get_underlying, is_leveraged, LEVERAGE_MAP, MARKET_SYMBOLS,
+    get_exchange_rate, get_current_price, fetch_many,
+    get_bulk_stock_data_async, get_stock_data_async,
+    gather_fundamentals_async, get_exchange_rate_async
 )
 from indicators import (
-    calculate_all_indicators, calculate_momentum,
-    calculate_support_resistance, detect_candle_patterns
+    calculate_momentum, calculate_support_resistance, detect_candle_patterns
 )
-from bitgak import (
-    calculate_bitgak_vwap, calculate_bitgak_csi,
-    calculate_bitgak_hvn, analyze_bitgak_signal
+from data_quality import repair_bars, has_issues, check_universe
+from panel import build_panel, compute_panel_indicators, panel_tail
+from indicator_cache import (
+    cache_path, load_cached, save_cached, cached_indicators, evict as evict_indicator_cache
 )
+from rolling_extrema import trailing_extrema
+from bitgak import analyze_bitgak_signal
 from strategy import generate_trading_strategy
 from portfolio import (
     load_portfolio, save_report, get_all_holdings
 )
 
+# 신호 판단에 쓰는 지표 (이 컬럼과 그 입력만 계산)
+SIGNAL_COLUMNS = [
+    'MA5', 'MA20', 'MA60', 'Tenkan', 'Kijun', 'SpanA', 'SpanB', 'RSI', 'MACD', 'MACD_Signal',
+    'BB_Upper', 'BB_Lower', 'Volume_Ratio', 'ATR_pct',
+]
 
-def analyze_signals(df, symbol, underlying=None):
-    """매수/매도 신호 분석"""
+
+def analyze_signals(df, symbol, underlying=None, recent=None, quality=None):
+    """
+    매수/매도 신호 분석
+
+    Args:
+        df: 일봉 DataFrame
+        symbol: 심볼
+        underlying: 원본 심볼 (레버리지 ETF인 경우)
+        recent: 미리 계산한 마지막 두 봉 지표 (패널 계산 결과, None이면 여기서 계산)
+        quality: 미리 보정한 경우 품질 리포트 (None이면 여기서 보정)
+    """
     if df is None or len(df) < 60:
         return {"symbol": symbol, "error": "데이터 부족"}
 
-    # 모든 지표 계산
-    df = calculate_all_indicators(df)
-    df = calculate_bitgak_vwap(df)
-    df = calculate_bitgak_csi(df)
-    df, hvn_price = calculate_bitgak_hvn(df)
+    # 중복/결측/튀는 값 보정
+    if quality is None:
+        df, quality = repair_bars(df, symbol)
+    if has_issues(quality):
+        print(f"[{symbol}] 데이터 보정: 중복 {quality['duplicates']}, 결측 {quality['missing_filled']}, "
+              f"부분 결측 {quality['partial_filled']}, 제거 {quality['dropped']}, 튐 {quality['outliers_clipped']}, "
+              f"OHLC {quality['ohlc_fixed']}, 거래량 {quality['volume_fixed']}")
+    if len(df) < 60:
+        return {"symbol": symbol, "error": "데이터 부족"}
 
-    latest = df.iloc[-1]
-    prev = df.iloc[-2]
+    # 모든 지표 계산 (신호 판단에는 마지막 두 봉만 필요 → tail 모드, 같은 데이터면 디스크 캐시 사용)
+    if recent is None or len(recent) < 2:
+        recent = cached_indicators(symbol, df, columns=SIGNAL_COLUMNS, tail=2)
+    latest = recent.iloc[-1]
+    prev = recent.iloc[-2]
 
     # 52주 고점/저점
-    high_52w = df['High'].tail(252).max() if len(df) >= 252 else df['High'].max()
-    low_52w = df['Low'].tail(252).min() if len(df) >= 252 else df['Low'].min()
+    high_52w = trailing_extrema(df['High'], [252], "max")[252]
+    low_52w = trailing_extrema(df['Low'], [252], "min")[252]
 
     signals = {
         "symbol": symbol,
@@ -61,7 +92,8 @@ def analyze_signals(df, symbol, underlying=None):
         "from_low_52w": round((latest['Close'] - low_52w) / low_52w * 100, 1),
         "indicators": {},
         "signals": [],
-        "recommendation": "HOLD"
+        "recommendation": "HOLD",
+        "data_quality": quality
     }
 
     score = 0
@@ -234,7 +266,7 @@ def analyze_signals(df, symbol, underlying=None):
             score -= 1
 
     # === 11. 빗각 분석 ===
-    bitgak_result = analyze_bitgak_signal(df)
+    bitgak_result = analyze_bitgak_signal(df, rsi=latest['RSI'])
     signals["bitgak"] = bitgak_result
 
     if bitgak_result.get("csi") is not None:
@@ -403,6 +435,97 @@ def sort_holdings(holdings):
     return sorted(holdings, key=sort_key)
 
 
+def _collect_symbols(all_holdings):
+    """일괄 요청할 심볼 목록 (원본 + 레버리지 + 시장지표)"""
+    symbols = []
+    for holding in all_holdings:
+        symbols.append(get_underlying(holding["symbol"]))
+        if is_leveraged(holding["symbol"]):
+            symbols.append(holding["symbol"])
+    symbols.extend(MARKET_SYMBOLS)
+    return list(dict.fromkeys(s.upper() for s in symbols))
+
+
+def _prepare_signal_inputs(frames):
+    """
+    원본 종목 일괄 보정 + 패널(시간 × 종목 행렬)로 지표 한 번에 계산
+    지표 캐시에 있는 종목은 계산하지 않고 로드 (전부 적중하면 패널도 만들지 않음)
+
+    Args:
+        frames: {원본 심볼: DataFrame}
+
+    Returns:
+        dict: {원본 심볼: (보정된 df, 품질 리포트, 마지막 두 봉 지표)}
+    """
+    repaired, reports = check_universe(frames)
+    usable = {s: df for s, df in repaired.items() if df is not None and len(df) >= 60}
+
+    paths = {s: cache_path(s, df, SIGNAL_COLUMNS, tail=2) for s, df in usable.items()}
+    recent = {s: load_cached(paths[s], df, SIGNAL_COLUMNS, tail=2) for s, df in usable.items()}
+    misses = {s: usable[s] for s, frame in recent.items() if frame is None}
+    if misses:
+        panel = build_panel(misses)
+        computed = panel_tail(panel, compute_panel_indicators(panel, SIGNAL_COLUMNS), tail=2)
+        for s, frame in computed.items():
+            save_cached(paths[s], frame, SIGNAL_COLUMNS)
+        recent.update(computed)
+    return {s: (repaired[s], reports[s], recent.get(s)) for s in frames}
+
+
+def _analyze_prepared(inputs, underlying):
+    """_prepare_signal_inputs 결과로 신호 분석"""
+    df, quality, recent = inputs
+    return analyze_signals(df, underlying, recent=recent, quality=quality)
+
+
+def _print_holding_header(holding):
+    """종목 분석 시작 출력"""
+    symbol = holding["symbol"]
+    market = holding.get("market", "us")
+    market_label = "[US]" if market == "us" else "[KR]" if market == "kr" else "[CRYPTO]"
+
+    if is_leveraged(symbol):
+        print(f"{market_label} [{symbol}] → [{get_underlying(symbol)}] 분석 중...")
+    else:
+        print(f"{market_label} [{symbol}] 분석 중...")
+
+
+def _build_holding_analysis(holding, signals, stock_data, fundamentals, market_indicators):
+    """원본 신호 분석 결과를 종목별 결과로 만들고 매매 전략 추가"""
+    symbol = holding["symbol"]
+    underlying = get_underlying(symbol)
+    is_lev = is_leveraged(symbol)
+
+    analysis = copy.deepcopy(signals)
+    analysis["symbol"] = symbol
+    if "underlying" in analysis:
+        analysis["underlying"] = underlying if is_lev else None
+    analysis["name"] = holding.get("name", "")
+    analysis["quantity"] = holding.get("quantity", 0)
+    analysis["is_leveraged"] = is_lev
+    analysis["market"] = holding.get("market", "us")
+
+    if is_lev:
+        lev_df = stock_data.get(symbol.upper())
+        if lev_df is None:
+            lev_df = get_stock_data(symbol, period="5d")
+        if lev_df is not None and len(lev_df) > 0:
+            analysis["leveraged_price"] = round(lev_df['Close'].iloc[-1], 2)
+
+    analysis["fundamentals"] = fundamentals.get(underlying) or {}
+
+    print(f"  매매 전략 생성 중...")
+    analysis["strategy"] = generate_trading_strategy(analysis, market_indicators)
+
+    rec = analysis.get('recommendation', 'N/A')
+    score = analysis.get('score', 'N/A')
+    action = analysis.get('strategy', {}).get('action', 'N/A')
+    bitgak = analysis.get('bitgak', {}).get('grade', 'NONE')
+    print(f"  → {rec} (점수: {score}) | 전략: {action} | 빗각: {bitgak}")
+
+    return analysis
+
+
 def analyze_portfolio():
     """포트폴리오 전체 분석"""
     portfolio = load_portfolio()
@@ -410,8 +533,21 @@ def analyze_portfolio():
         print("portfolio.json 파일이 없습니다.")
         return None
 
+    all_holdings = get_all_holdings(portfolio)
+    evict_indicator_cache()
+
+    # 원본/레버리지/시장지표 심볼을 한 번에 받아오기
+    symbols = _collect_symbols(all_holdings)
+    print(f"주가 데이터 일괄 다운로드 중... ({len(symbols)}종목)")
+    stock_data = get_bulk_stock_data(symbols, period="1y")
+
+    # 펀더멘털은 종목별 요청이므로 동시에 받아오기
+    underlyings = [get_underlying(h["symbol"]) for h in all_holdings]
+    print(f"펀더멘털 데이터 가져오는 중... ({len(set(underlyings))}종목)")
+    fundamentals = fetch_many(get_fundamentals, underlyings)
+
     print("시장 지표 분석 중...")
-    market_indicators = get_market_indicators()
+    market_indicators = get_market_indicators(stock_data)
     print(f"  VIX: {market_indicators.get('vix', 'N/A')} ({market_indicators.get('sentiment_desc', '')})")
 
     results = {
@@ -420,50 +556,110 @@ def analyze_portfolio():
         "holdings": []
     }
 
-    all_holdings = get_all_holdings(portfolio)
+    # 원본 종목 지표는 패널로 한 번에 계산
+    frames = {}
+    for underlying in dict.fromkeys(u.upper() for u in underlyings):
+        df = stock_data.get(underlying)
+        frames[underlying] = df if df is not None else get_stock_data(underlying, period="1y")
+    prepared = _prepare_signal_inputs(frames)
 
-    for holding in all_holdings:
-        symbol = holding["symbol"]
-        market = holding.get("market", "us")
-        underlying = get_underlying(symbol)
-        is_lev = is_leveraged(symbol)
+    # 같은 원본을 참조하는 종목(CONL/COIN 등)은 한 번만 분석하고 결과를 복사
+    signal_cache = {}
 
-        market_label = "[US]" if market == "us" else "[KR]" if market == "kr" else "[CRYPTO]"
+    for holding in all_holdings:
+        underlying = get_underlying(holding["symbol"])
+        _print_holding_header(holding)
 
-        if is_lev:
-            print(f"{market_label} [{symbol}] → [{underlying}] 분석 중...")
+        if underlying.upper() not in signal_cache:
+            signal_cache[underlying.upper()] = _analyze_prepared(prepared[underlying.upper()], underlying)
         else:
-            print(f"{market_label} [{symbol}] 분석 중...")
+            print(f"  [{underlying}] 분석 결과 재사용")
 
-        df = get_stock_data(underlying, period="1y")
-        analysis = analyze_signals(df, symbol, underlying if is_lev else None)
-        analysis["name"] = holding.get("name", "")
-        analysis["quantity"] = holding.get("quantity", 0)
-        analysis["is_leveraged"] = is_lev
-        analysis["market"] = market
+        results["holdings"].append(_build_holding_analysis(
+            holding, signal_cache[underlying.upper()],
+            stock_data, fundamentals, market_indicators
+        ))
 
-        if is_lev:
-            lev_df = get_stock_data(symbol, period="5d")
-            if lev_df is not None and len(lev_df) > 0:
-                analysis["leveraged_price"] = round(lev_df['Close'].iloc[-1], 2)
+    # 정렬: 보유 종목 먼저, 그 다음 추천순
+    results["holdings"] = sort_holdings(results["holdings"])
+
+    # 환율 가져오기
+    exchange_rate = get_exchange_rate("USD", "KRW") or 1420  # 기본값
+    results["summary"] = summarize_portfolio(portfolio, results["holdings"], exchange_rate)
 
-        print(f"  펀더멘털 데이터 가져오는 중...")
-        analysis["fundamentals"] = get_fundamentals(underlying)
+    return results
 
-        print(f"  매매 전략 생성 중...")
-        analysis["strategy"] = generate_trading_strategy(analysis, market_indicators)
 
-        results["holdings"].append(analysis)
+async def analyze_portfolio_async():
+    """
+    포트폴리오 전체 분석 (asyncio)
+    - 주가/펀더멘털/환율 요청을 동시에 실행
+    - 지표 계산(CPU)은 executor에서 실행해 이벤트 루프를 막지 않음
+    """
+    portfolio = load_portfolio()
+    if not portfolio:
+        print("portfolio.json 파일이 없습니다.")
+        return None
 
-        rec = analysis.get('recommendation', 'N/A')
-        score = analysis.get('score', 'N/A')
-        action = analysis.get('strategy', {}).get('action', 'N/A')
-        bitgak = analysis.get('bitgak', {}).get('grade', 'NONE')
-        print(f"  → {rec} (점수: {score}) | 전략: {action} | 빗각: {bitgak}")
+    loop = asyncio.get_running_loop()
+    all_holdings = get_all_holdings(portfolio)
+    evict_indicator_cache()
+
+    symbols = _collect_symbols(all_holdings)
+    underlyings = list(dict.fromkeys(get_underlying(h["symbol"]) for h in all_holdings))
+    print(f"주가/펀더멘털/환율 동시 요청 중... ({len(symbols)}종목)")
+
+    stock_data, fundamentals, exchange_rate = await asyncio.gather(
+        get_bulk_stock_data_async(symbols, period="1y"),
+        gather_fundamentals_async(underlyings),
+        get_exchange_rate_async("USD", "KRW"),
+    )
+
+    # 일괄 요청에서 빠진 종목만 개별 요청
+    missing = [s for s in symbols if s not in stock_data and s not in MARKET_SYMBOLS]
+    if missing:
+        frames = await asyncio.gather(*(
+            get_stock_data_async(s, period="1y") for s in missing
+        ))
+        stock_data.update({s: df for s, df in zip(missing, frames) if df is not None})
+
+    print("시장 지표 분석 중...")
+    market_indicators = await asyncio.to_thread(get_market_indicators, stock_data)
+    print(f"  VIX: {market_indicators.get('vix', 'N/A')} ({market_indicators.get('sentiment_desc', '')})")
+
+    # 원본별 지표 계산 (CPU 작업, 지표는 패널로 한 번에)
+    prepared = await asyncio.to_thread(
+        _prepare_signal_inputs, {u.upper(): stock_data.get(u.upper()) for u in underlyings}
+    )
+    signal_list = await asyncio.gather(*(
+        loop.run_in_executor(None, _analyze_prepared, prepared[u.upper()], u)
+        for u in underlyings
+    ))
+    signal_cache = {u.upper(): sig for u, sig in zip(underlyings, signal_list)}
+
+    results = {
+        "analyzed_at": datetime.now().isoformat(),
+        "market": market_indicators,
+        "holdings": []
+    }
+
+    for holding in all_holdings:
+        _print_holding_header(holding)
+        results["holdings"].append(_build_holding_analysis(
+            holding, signal_cache[get_underlying(holding["symbol"]).upper()],
+            stock_data, fundamentals, market_indicators
+        ))
 
-    # 정렬: 보유 종목 먼저, 그 다음 추천순
     results["holdings"] = sort_holdings(results["holdings"])
 
+    exchange_rate = exchange_rate or 1420  # 기본값
+    results["summary"] = summarize_portfolio(portfolio, results["holdings"], exchange_rate)
+
+    return results
+
+
+def summarize_portfolio(portfolio, holdings, exchange_rate):
+    """포트폴리오 요약 (보유 종목 평가금액, 현금, 총 자산)"""
     # === 포트폴리오 요약 계산 ===
     print("\n포트폴리오 요약 계산 중...")
 
@@ -472,8 +668,6 @@ def analyze_portfolio():
     cash_usd = cash.get("usd", 0)
     cash_krw = cash.get("krw", 0)
 
-    # 환율 가져오기
-    exchange_rate = get_exchange_rate("USD", "KRW") or 1420  # 기본값
     print(f"  환율: $1 = {exchange_rate:,.0f}원")
 
     # 투자 자산 계산
@@ -482,7 +676,7 @@ def analyze_portfolio():
 
     holdings_summary = []
 
-    for h in results["holdings"]:
+    for h in holdings:
         qty = h.get("quantity", 0)
         if qty <= 0:
             continue
@@ -531,7 +725,7 @@ def analyze_portfolio():
     total_cash_in_krw = (cash_usd * exchange_rate) + cash_krw
     grand_total_krw = total_usd_in_krw + total_krw + total_cash_in_krw
 
-    results["summary"] = {
+    summary = {
         "exchange_rate": exchange_rate,
         "investments": {
             "usd": round(total_usd, 2),  # USD 투자총액 (미국+코인)
@@ -552,7 +746,7 @@ def analyze_portfolio():
     print(f"  현금: ${cash_usd:,.2f} + {cash_krw:,.0f}원")
     print(f"  총 자산: {grand_total_krw:,.0f}원")
 
-    return results
+    return summary
 
 
 if __name__ == "__main__":
@@ -0,0 +1,291 @@
+"""
+주가 데이터 로컬 저장소 모듈
+- 종목별 일봉을 data/bars/ 에 컬럼 단위(npz)로 저장
+- 저장된 마지막 날짜 이후 구간만 추가로 받아 이어붙이기
+- 야후 장애 시 저장된 데이터로 분석 계속
+- 새 분할/배당이 생기면 저장된 봉에 조정 계수 적용 (전체 재요청 없음)
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BARS_DIR = os.path.join(BASE_DIR, "data", "bars")
+
+# 저장 컬럼 (yfinance history 컬럼과 동일)
+BAR_COLUMNS = ["Open", "High", "Low", "Close", "Volume", "Dividends", "Stock Splits"]
+
+# 조정 대상 컬럼
+PRICE_COLUMNS = ["Open", "High", "Low", "Close"]
+
+# 전체 기간(max) 요청을 나타내는 시작일 (epoch day)
+MAX_PERIOD_START = np.iinfo(np.int64).min
+
+_PERIOD_UNITS = {
+    "d": lambda n: pd.DateOffset(days=n),
+    "wk": lambda n: pd.DateOffset(weeks=n),
+    "mo": lambda n: pd.DateOffset(months=n),
+    "y": lambda n: pd.DateOffset(years=n),
+}
+
+
+def _bar_path(symbol):
+    """심볼별 저장 파일 경로 (^, = 등 파일명에 쓰기 어려운 문자 치환)"""
+    safe = "".join(c if c.isalnum() or c in "-." else "_" for c in symbol.upper())
+    return os.path.join(BARS_DIR, f"{safe}.npz")
+
+
+def to_epoch_days(index):
+    """DatetimeIndex → epoch day(int64) 배열 (타임존은 현지 날짜 기준)"""
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.normalize().values.astype("datetime64[D]").astype(np.int64)
+
+
+def from_epoch_days(days):
+    """epoch day 배열 → DatetimeIndex"""
+    return pd.DatetimeIndex(np.asarray(days, dtype="datetime64[D]").astype("datetime64[ns]"))
+
+
+def period_start(period, today=None):
+    """
+    yfinance period 문자열 → 시작일 (epoch day)
+
+    Args:
+        period: "5d", "3mo", "1y", "ytd", "max" 등
+        today: 기준일 (None이면 오늘)
+    """
+    today = pd.Timestamp(today or pd.Timestamp.now()).normalize()
+    if period == "max":
+        return MAX_PERIOD_START
+    if period == "ytd":
+        start = today.replace(month=1, day=1)
+    else:
+        for unit, offset in _PERIOD_UNITS.items():
+            if period.endswith(unit) and period[:-len(unit)].isdigit():
+                start = today - offset(int(period[:-len(unit)]))
+                break
+        else:
+            raise ValueError(f"지원하지 않는 기간: {period}")
+    return int(to_epoch_days([start])[0])
+
+
+def load_bar_arrays(symbol):
+    """
+    저장된 일봉을 배열 그대로 로드 (DataFrame 생성 없음)
+
+    Returns:
+        (days, {컬럼: 배열}, covered_from) 또는 (None, None, None)
+    """
+    path = _bar_path(symbol)
+    if not os.path.exists(path):
+        return None, None, None
+
+    try:
+        with np.load(path) as store:
+            days = store["date"]
+            columns = {col: store[col] for col in BAR_COLUMNS if col in store.files}
+            covered_from = int(store["covered_from"])
+    except Exception as e:
+        print(f"[{symbol}] 저장된 데이터 읽기 실패: {e}")
+        return None, None, None
+
+    return days, columns, covered_from
+
+
+def load_bars(symbol):
+    """
+    저장된 일봉 로드
+
+    Returns:
+        (DataFrame, covered_from) 또는 (None, None)
+        covered_from: 빠짐없이 받아둔 구간의 시작일 (epoch day)
+    """
+    days, columns, covered_from = load_bar_arrays(symbol)
+    if days is None:
+        return None, None
+
+    df = pd.DataFrame(columns, index=from_epoch_days(days))
+    df.index.name = "Date"
+    return df, covered_from
+
+
+def save_bars(symbol, df, covered_from):
+    """일봉 저장 (임시 파일에 쓴 뒤 교체)"""
+    os.makedirs(BARS_DIR, exist_ok=True)
+    path = _bar_path(symbol)
+    tmp_path = path + ".tmp"
+
+    arrays = {
+        col: df[col].to_numpy(dtype=np.float64)
+        for col in BAR_COLUMNS if col in df.columns
+    }
+    with open(tmp_path, "wb") as f:
+        np.savez(
+            f,
+            date=to_epoch_days(df.index),
+            covered_from=np.int64(covered_from),
+            **arrays
+        )
+    os.replace(tmp_path, path)
+    return path
+
+
+def corporate_actions(df):
+    """
+    분할/배당 행 추출
+
+    Returns:
+        (days, splits, dividends): 분할 비율(없으면 0), 주당 배당금(없으면 0)
+    """
+    if df is None or len(df) == 0:
+        empty = np.empty(0)
+        return np.empty(0, dtype=np.int64), empty, empty
+
+    n = len(df)
+    splits = df["Stock Splits"].to_numpy(dtype=np.float64) if "Stock Splits" in df.columns else np.zeros(n)
+    dividends = df["Dividends"].to_numpy(dtype=np.float64) if "Dividends" in df.columns else np.zeros(n)
+    splits = np.nan_to_num(splits)
+    dividends = np.nan_to_num(dividends)
+
+    mask = ((splits > 0) & (splits != 1)) | (dividends > 0)
+    return to_epoch_days(df.index[mask]), splits[mask], dividends[mask]
+
+
+def load_actions(symbol):
+    """
+    저장소에 기록된 분할/배당 내역
+
+    Returns:
+        DataFrame (index: 날짜, columns: Stock Splits, Dividends) 또는 None
+    """
+    days, columns, _ = load_bar_arrays(symbol)
+    if days is None:
+        return None
+    df = pd.DataFrame(
+        {col: columns[col] for col in ("Dividends", "Stock Splits") if col in columns},
+        index=from_epoch_days(days),
+    )
+    days, splits, dividends = corporate_actions(df)
+    return pd.DataFrame(
+        {"Stock Splits": splits, "Dividends": dividends},
+        index=pd.DatetimeIndex(from_epoch_days(days), name="Date"),
+    )
+
+
+def adjust_bar_arrays(days, columns, action_days, splits, dividends, prev_close=None):
+    """
+    분할/배당 조정 계수를 저장된 배열에 제자리 적용 (벡터화)
+
+    각 액션의 기준일(ex-date) 이전 봉에만 적용
+    - 분할 비율 r: 가격 ÷ r, 거래량 × r
+    - 배당 d: 가격 × (1 - d / 기준일 전날 종가)
+
+    Args:
+        days: 저장된 봉 날짜 (epoch day, 오름차순)
+        columns: {컬럼: float64 배열} (제자리 수정)
+        action_days, splits, dividends: corporate_actions() 결과 중 새로 생긴 액션
+        prev_close: 액션별 기준일 전날 종가 (None이면 저장된 종가 사용)
+    """
+    n = len(days)
+    if n == 0 or len(action_days) == 0:
+        return
+
+    pos = np.searchsorted(days, action_days, side="left")
+    if prev_close is None:
+        prev_close = columns["Close"][np.maximum(pos - 1, 0)]
+
+    split_factor = np.where(splits > 0, splits, 1.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dividend_factor = np.where(
+            (dividends > 0) & (prev_close > 0) & (pos > 0),
+            1.0 - dividends / prev_close,
+            1.0,
+        )
+    dividend_factor = np.where(dividend_factor > 0, dividend_factor, 1.0)
+
+    # 위치 p의 계수는 p 이전 봉 전체에 적용 → 뒤에서부터 누적곱
+    price_steps = np.ones(n + 1)
+    volume_steps = np.ones(n + 1)
+    np.multiply.at(price_steps, pos, dividend_factor / split_factor)
+    np.multiply.at(volume_steps, pos, split_factor)
+    price_factor = np.cumprod(price_steps[::-1])[::-1][1:]
+    volume_factor = np.cumprod(volume_steps[::-1])[::-1][1:]
+
+    for col in PRICE_COLUMNS:
+        if col in columns:
+            columns[col] *= price_factor
+    if "Volume" in columns:
+        columns["Volume"] *= volume_factor
+
+
+def _adjust_stored(stored, new):
+    """새 데이터에 처음 나타난 분할/배당을 저장된 봉에 반영"""
+    stored_days = to_epoch_days(stored.index)
+    known_days, _, _ = corporate_actions(stored)
+    days, splits, dividends = corporate_actions(new)
+
+    # 저장된 첫 봉 이후이면서 아직 반영되지 않은 (저장된 봉에 기록이 없는) 액션만
+    known = np.isin(days, known_days)
+    pending = ~known & (days > stored_days[0])
+    if not pending.any():
+        return stored
+
+    days, splits, dividends = days[pending], splits[pending], dividends[pending]
+    columns = {
+        col: stored[col].to_numpy(dtype=np.float64, copy=True)
+        for col in PRICE_COLUMNS + ["Volume"] if col in stored.columns
+    }
+
+    # 배당 계수용 전날 종가: 새 데이터에 있으면 그 값 + 배당금 (야후가 이미 조정한 값을 되돌림)
+    new_days = to_epoch_days(new.index)
+    new_close = new["Close"].to_numpy(dtype=np.float64)
+    prev_close = columns["Close"][np.maximum(np.searchsorted(stored_days, days) - 1, 0)]
+    new_pos = np.searchsorted(new_days, days) - 1
+    from_new = new_pos >= 0
+    prev_close[from_new] = new_close[new_pos[from_new]] + dividends[from_new]
+
+    adjust_bar_arrays(stored_days, columns, days, splits, dividends, prev_close)
+    adjusted = stored.copy()
+    for col, values in columns.items():
+        adjusted[col] = values
+    return adjusted
+
+
+def merge_bars(stored, new):
+    """
+    저장된 일봉 + 새로 받은 일봉 병합
+    같은 날짜는 새 데이터로 덮어씀 (장중에 저장된 미완성 봉 갱신)
+    새로 생긴 분할/배당은 저장된 봉에 조정 계수로 반영
+    """
+    new = normalize_bars(new)
+    if stored is None or len(stored) == 0:
+        return new
+    if new is None or len(new) == 0:
+        return stored
+
+    stored = _adjust_stored(stored, new)
+    merged = pd.concat([stored, new])
+    merged = merged[~merged.index.duplicated(keep="last")]
+    return merged.sort_index()
+
+
+def normalize_bars(df):
+    """인덱스를 타임존 없는 날짜로 맞추고 저장 컬럼만 남기기"""
+    if df is None or len(df) == 0:
+        return df
+    df = df[[col for col in BAR_COLUMNS if col in df.columns]].copy()
+    df.index = from_epoch_days(to_epoch_days(df.index))
+    df.index.name = "Date"
+    df = df[~df.index.duplicated(keep="last")]
+    return df.sort_index()
+
+
+def slice_period(df, start):
+    """시작일(epoch day) 이후 구간만 반환"""
+    if df is None or start == MAX_PERIOD_START:
+        return df
+    return df[df.index >= from_epoch_days([start])[0]]
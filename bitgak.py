@@ -16,35 +16,46 @@
 import pandas as pd
 import numpy as np
 
+import indicator_graph as graph
+from indicator_graph import BASE_COLUMNS
+from indicator_result import indicator_result
+from ohlcv import as_frame
+from rolling_extrema import centered_extrema
 
-def calculate_bitgak_vwap(df, period=None):
+
+def calculate_bitgak_vwap(df, period=None, dtype=None):
     """
     VWAP (Volume Weighted Average Price) 계산
     = 군중의 평균 매수가
 
     Args:
-        df: OHLCV 데이터프레임
+        df: OHLCV 데이터프레임 (또는 IndicatorResult)
         period: 계산 기간 (None이면 전체 기간)
+        dtype: 계산 dtype (None이면 indicator_graph dtype 정책)
+
+    Returns:
+        IndicatorResult (입력 df는 수정하지 않음)
     """
-    if period:
-        df_calc = df.tail(period).copy()
-    else:
-        df_calc = df.copy()
+    out = indicator_result(df, dtype=dtype or graph.get_dtype())
+    base = {col: out[col] for col in BASE_COLUMNS}
+    values = graph.compute(base, ['_typical_price', 'VWAP_20'], dtype=out.dtype)
 
     # 전형적인 가격 (TP) = (고가 + 저가 + 종가) / 3
-    typical_price = (df_calc['High'] + df_calc['Low'] + df_calc['Close']) / 3
+    # VWAP = Σ(TP × 거래량) / Σ(거래량), period 이전 봉은 NaN
+    start = max(len(out) - period, 0) if period else 0
+    vwap = np.full(len(out), np.nan)
+    tp, volume = values['_typical_price'][start:], base['Volume'][start:]
+    # 누적합은 float64 (float32 정책에서도 자릿수 손실 방지)
+    vwap[start:] = graph._divide(np.cumsum(tp * volume, dtype=np.float64), np.cumsum(volume, dtype=np.float64))
+    out['VWAP'] = vwap
 
-    # VWAP = Σ(TP × 거래량) / Σ(거래량)
-    df['VWAP'] = (typical_price * df_calc['Volume']).cumsum() / df_calc['Volume'].cumsum()
+    # 20일 롤링 VWAP (최근 추세 반영, 지표 그래프의 TP/거래량 합 공유)
+    out['VWAP_20'] = values['VWAP_20']
 
-    # 20일 롤링 VWAP (최근 추세 반영)
-    tp = (df['High'] + df['Low'] + df['Close']) / 3
-    df['VWAP_20'] = (tp * df['Volume']).rolling(20).sum() / df['Volume'].rolling(20).sum()
+    return out
 
-    return df
 
-
-def calculate_bitgak_csi(df):
+def calculate_bitgak_csi(df, dtype=None):
     """
     CSI (Crowd Stress Index) - 군중 스트레스 지수
     = (현재가 - VWAP) / VWAP × 100
@@ -53,46 +64,55 @@ def calculate_bitgak_csi(df):
     - CSI < -10%: 군중 대부분 손실 → 공포/존버 구간
     - CSI > +10%: 군중 대부분 수익 → 차익실현 압력
     - CSI ≈ 0%: 본전 심리 구간 → 매수/탈출 심리 충돌
+
+    Args:
+        dtype: 계산 dtype (None이면 indicator_graph dtype 정책)
     """
-    if 'VWAP_20' not in df.columns:
-        df = calculate_bitgak_vwap(df)
+    out = indicator_result(df, dtype=dtype or graph.get_dtype())
+    if 'VWAP_20' not in out:
+        out = calculate_bitgak_vwap(out)
 
     # 20일 VWAP 기준 CSI (최근 매수자 기준)
-    df['CSI'] = (df['Close'] - df['VWAP_20']) / df['VWAP_20'] * 100
+    out['CSI'] = (out['Close'] - out['VWAP_20']) / out['VWAP_20'] * 100
 
-    return df
+    return out
 
 
-def calculate_bitgak_hvn(df, lookback=60):
+def calculate_bitgak_hvn(df, lookback=60, dtype=None):
     """
     HVN (High Volume Node) - 매물대 계산
     거래량이 집중된 가격대 = 많은 사람이 매수한 가격 = 지지/저항
 
     Args:
-        df: OHLCV 데이터프레임
+        df: OHLCV 데이터프레임 (또는 IndicatorResult)
         lookback: 분석 기간
+        dtype: 계산 dtype (None이면 indicator_graph dtype 정책)
 
     Returns:
-        HVN 가격대, 근접도 추가된 df
+        (IndicatorResult, HVN 가격)
+        HVN 가격은 컬럼으로 늘리지 않고 스칼라(HVN_Price)로, 근접도는 HVN_Proximity 컬럼
     """
-    recent = df.tail(lookback).copy()
+    out = indicator_result(df, dtype=dtype or graph.get_dtype())
+    close = out['Close'][-lookback:]
+    volume = out['Volume'][-lookback:]
 
     # 거래량 기준 상위 20% 거래일의 평균 가격 = 핵심 매물대
-    vol_threshold = recent['Volume'].quantile(0.8)
-    high_vol_days = recent[recent['Volume'] >= vol_threshold]
+    vol_threshold = pd.Series(volume).quantile(0.8)
+    high_vol = volume >= vol_threshold
 
-    if len(high_vol_days) > 0:
+    if high_vol.any():
         # 고거래량일의 가중평균 가격
-        hvn_price = (high_vol_days['Close'] * high_vol_days['Volume']).sum() / high_vol_days['Volume'].sum()
+        hvn_price = (np.nansum(close[high_vol] * volume[high_vol], dtype=np.float64)
+                     / volume[high_vol].sum(dtype=np.float64))
     else:
-        hvn_price = recent['Close'].mean()
+        hvn_price = np.nanmean(close, dtype=np.float64)
 
-    df['HVN_Price'] = hvn_price
+    out.set_scalar('HVN_Price', hvn_price)
 
     # 매물대 근접도 (%)
-    df['HVN_Proximity'] = abs(df['Close'] - hvn_price) / df['Close'] * 100
+    out['HVN_Proximity'] = np.abs(out['Close'] - hvn_price) / out['Close'] * 100
 
-    return df, hvn_price
+    return out, hvn_price
 
 
 def find_bitgak_lines(df, lookback=60):
@@ -104,12 +124,13 @@ def find_bitgak_lines(df, lookback=60):
     Returns:
         list of bitgak lines (slope, intercept, type)
     """
+    df = as_frame(df)
     recent = df.tail(lookback).copy()
     vol_avg = recent['Volume'].mean()
 
     # 로컬 고점 찾기 (5일 기준)
-    recent['Local_High'] = recent['High'].rolling(5, center=True).max()
-    recent['Local_Low'] = recent['Low'].rolling(5, center=True).min()
+    recent['Local_High'] = centered_extrema(recent['High'].to_numpy(dtype=np.float64), 5, "max")
+    recent['Local_Low'] = centered_extrema(recent['Low'].to_numpy(dtype=np.float64), 5, "min")
 
     # 거래량이 평균 이상인 변곡점만
     significant_highs = recent[
@@ -169,10 +190,16 @@ def detect_bitgak_touch(current_price, bitgak_lines, current_idx, tolerance=0.02
     return False, None, None
 
 
-def analyze_bitgak_signal(df, lookback=60):
+def analyze_bitgak_signal(df, lookback=60, rsi=None, dtype=None):
     """
     빗각 투자 종합 신호 분석
 
+    Args:
+        df: OHLCV 데이터프레임
+        lookback: 분석 기간
+        rsi: 현재 RSI (None이면 df의 RSI 컬럼 사용)
+        dtype: 계산 dtype (None이면 indicator_graph dtype 정책)
+
     Returns:
         dict: 빗각 분석 결과
         - score: 빗각 신호 점수 (0~3)
@@ -180,15 +207,15 @@ def analyze_bitgak_signal(df, lookback=60):
         - csi: 군중 스트레스 지수
         - hvn_proximity: 매물대 근접도
     """
+    df = as_frame(df)
     if len(df) < lookback:
         return {"score": 0, "signals": [], "error": "데이터 부족"}
 
-    # 지표 계산
-    df = calculate_bitgak_vwap(df)
-    df = calculate_bitgak_csi(df)
-    df, hvn_price = calculate_bitgak_hvn(df, lookback)
+    # 지표 계산 (df는 수정하지 않고 결과 버퍼에 기록)
+    out = calculate_bitgak_csi(calculate_bitgak_vwap(df, dtype=dtype))
+    out, hvn_price = calculate_bitgak_hvn(out, lookback)
 
-    latest = df.iloc[-1]
+    latest = out.latest()
     score = 0
     signals = []
 
@@ -231,7 +258,8 @@ def analyze_bitgak_signal(df, lookback=60):
                 signals.append(f"📐 상승 빗각 터치 (${line_price}) - 지지 확인")
 
     # 4. RSI 과매도 보조 조건 (기존 RSI 활용)
-    rsi = latest.get('RSI', 50)
+    if rsi is None:
+        rsi = latest.get('RSI', 50)
     if pd.notna(rsi) and rsi < 35:
         score += 0.5
         signals.append(f"🔻 RSI {rsi:.1f} 과매도 (빗각 신호 보강)")
@@ -258,9 +286,16 @@ def analyze_bitgak_signal(df, lookback=60):
     }
 
 
-def calculate_all_bitgak(df, lookback=60):
-    """빗각 지표 한번에 계산"""
-    df = calculate_bitgak_vwap(df)
-    df = calculate_bitgak_csi(df)
-    df, hvn_price = calculate_bitgak_hvn(df, lookback)
-    return df, hvn_price
+def calculate_all_bitgak(df, lookback=60, dtype=None):
+    """
+    빗각 지표 한번에 계산
+
+    Args:
+        dtype: 계산 dtype (None이면 indicator_graph dtype 정책, calculate_all_indicators와 같음)
+
+    Returns:
+        (OHLCV + 빗각 지표 DataFrame, HVN 가격) (원본 df는 수정하지 않음)
+    """
+    out = calculate_bitgak_csi(calculate_bitgak_vwap(df, dtype=dtype))
+    out, hvn_price = calculate_bitgak_hvn(out, lookback)
+    return out.to_frame(), hvn_price
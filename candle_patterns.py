@@ -0,0 +1,155 @@
+"""
+캔들 패턴 스캐너
+- 전체 이력에 대해 패턴별 불리언 배열을 한 번에 계산 (마지막 봉만 보는 iloc 루프 없음)
+- 1차원(종목 하나)과 (시간 × 종목) 2차원 배열 모두 같은 코드로 계산 (panel.Panel 그대로 사용)
+- 패턴 적중률 집계 (백테스트용)
+- 기존 패턴(도지, 망치형, 역망치형, 교수형, 장악형, 샛별형)은 indicators.detect_candle_patterns와 같은 기준
+"""
+
+import numpy as np
+import pandas as pd
+
+from indicator_graph import shift
+
+# 패턴명 → 방향 (1: 상승 신호, -1: 하락 신호, 0: 중립)
+PATTERNS = {
+    "doji": 0,
+    "hammer": 1,
+    "inverted_hammer": 1,
+    "hanging_man": -1,
+    "bullish_engulfing": 1,
+    "bearish_engulfing": -1,
+    "morning_star": 1,
+    "evening_star": -1,
+    "bullish_harami": 1,
+    "bearish_harami": -1,
+    "three_white_soldiers": 1,
+    "three_black_crows": -1,
+    "piercing": 1,
+    "dark_cloud": -1,
+}
+
+
+def _candles(o, h, l, c):
+    """봉 모양 (몸통, 꼬리, 양봉/음봉)"""
+    return {
+        "open": o,
+        "close": c,
+        "body": np.abs(c - o),
+        "upper": h - np.fmax(o, c),
+        "lower": np.fmin(o, c) - l,
+        "range": h - l,
+        "bull": c > o,
+        "bear": c < o,
+    }
+
+
+def _previous(bar, periods):
+    prev = {k: shift(v, periods) for k, v in bar.items() if k not in ("bull", "bear")}
+    prev["bull"] = prev["close"] > prev["open"]
+    prev["bear"] = prev["close"] < prev["open"]
+    return prev
+
+
+def scan_candle_patterns(open, high, low, close, patterns=None):
+    """
+    캔들 패턴 전체 이력 스캔
+
+    Args:
+        open, high, low, close: 1차원 배열 또는 (시간 × 종목) 2차원 배열
+        patterns: 계산할 패턴명 리스트 (None이면 PATTERNS 전체)
+
+    Returns:
+        dict: {패턴명: 불리언 배열 (입력과 같은 모양)}
+    """
+    arrays = [np.asarray(x, dtype=np.float64) for x in (open, high, low, close)]
+    cur = _candles(*arrays)
+    p1 = _previous(cur, 1)
+    p2 = _previous(cur, 2)
+    body, upper, lower = cur["body"], cur["upper"], cur["lower"]
+    o, c = cur["open"], cur["close"]
+
+    found = {}
+
+    # 한 봉 패턴
+    found["doji"] = body / np.where(cur["range"] > 0, cur["range"], np.nan) < 0.1
+    long_lower = (lower > body * 2) & (upper < body * 0.5)
+    long_upper = (upper > body * 2) & (lower < body * 0.5)
+    found["hammer"] = long_lower & (c < p1["close"])
+    found["inverted_hammer"] = long_upper & (c < p1["close"])
+    found["hanging_man"] = long_lower & (c > p1["close"])
+
+    # 두 봉 패턴
+    engulf = body > p1["body"] * 1.5
+    found["bullish_engulfing"] = engulf & cur["bull"] & p1["bear"]
+    found["bearish_engulfing"] = engulf & cur["bear"] & p1["bull"]
+
+    # 잉태형: 전날 몸통 안에 오늘 몸통
+    inside = (np.fmax(o, c) < np.fmax(p1["open"], p1["close"])) & (np.fmin(o, c) > np.fmin(p1["open"], p1["close"]))
+    found["bullish_harami"] = inside & p1["bear"] & cur["bull"]
+    found["bearish_harami"] = inside & p1["bull"] & cur["bear"]
+
+    # 관통형/먹구름형: 전날 종가 밖에서 시작해 전날 몸통 절반 넘게 되돌림
+    mid = (p1["open"] + p1["close"]) / 2
+    found["piercing"] = p1["bear"] & cur["bull"] & (o < p1["close"]) & (c > mid) & (c < p1["open"])
+    found["dark_cloud"] = p1["bull"] & cur["bear"] & (o > p1["close"]) & (c < mid) & (c > p1["open"])
+
+    # 세 봉 패턴
+    small_middle = p1["body"] < p2["body"] * 0.3
+    big_last = body > p2["body"] * 0.5
+    found["morning_star"] = p2["bear"] & small_middle & cur["bull"] & big_last
+    found["evening_star"] = p2["bull"] & small_middle & cur["bear"] & big_last
+
+    # 적삼병/흑삼병: 같은 방향 세 봉, 종가 연속 갱신, 시가는 전날 몸통 안
+    opens_inside = ((o > p1["open"]) & (o < p1["close"]) & (p1["open"] > p2["open"]) & (p1["open"] < p2["close"]))
+    found["three_white_soldiers"] = (
+        p2["bull"] & p1["bull"] & cur["bull"] & (c > p1["close"]) & (p1["close"] > p2["close"]) & opens_inside
+    )
+    opens_inside = ((o < p1["open"]) & (o > p1["close"]) & (p1["open"] < p2["open"]) & (p1["open"] > p2["close"]))
+    found["three_black_crows"] = (
+        p2["bear"] & p1["bear"] & cur["bear"] & (c < p1["close"]) & (p1["close"] < p2["close"]) & opens_inside
+    )
+
+    # 고가 = 저가인 봉은 판정하지 않음
+    flat = ~(cur["range"] > 0)
+    names = list(PATTERNS) if patterns is None else list(patterns)
+    return {name: found[name] & ~flat for name in names}
+
+
+def scan_frame(df, patterns=None):
+    """OHLCV DataFrame → 패턴 불리언 DataFrame (행: 봉, 열: 패턴명)"""
+    found = scan_candle_patterns(df['Open'], df['High'], df['Low'], df['Close'], patterns)
+    return pd.DataFrame(found, index=df.index)
+
+
+def scan_panel(panel, patterns=None):
+    """panel.Panel → {패턴명: (시간 × 종목) 불리언 행렬}"""
+    return scan_candle_patterns(panel.open, panel.high, panel.low, panel.close, patterns)
+
+
+def pattern_hit_rates(found, close, horizon=5):
+    """
+    패턴별 적중률 (패턴 발생 후 horizon봉 수익률이 패턴 방향과 같은 비율)
+
+    Args:
+        found: scan_candle_patterns 결과
+        close: 종가 배열 (found와 같은 모양)
+        horizon: 보유 봉 수
+
+    Returns:
+        DataFrame: 패턴별 발생 횟수, 적중률(%), 평균 수익률(%)
+    """
+    close = np.asarray(close, dtype=np.float64)
+    forward = (shift(close, -horizon) / close - 1) * 100
+    rows = []
+    for name, mask in found.items():
+        returns = forward[mask & ~np.isnan(forward)]
+        direction = PATTERNS.get(name, 0)
+        hits = (returns * direction > 0).mean() * 100 if len(returns) and direction else np.nan
+        rows.append({
+            "pattern": name,
+            "count": int(len(returns)),
+            "hit_rate": round(float(hits), 1) if not np.isnan(hits) else None,
+            "avg_return": round(float(returns.mean()), 2) if len(returns) else None,
+        })
+    return pd.DataFrame(rows).set_index("pattern")
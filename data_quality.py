@@ -0,0 +1,201 @@
+"""
+시세 데이터 품질 검사/보정 모듈
+- 지표 계산 전에 야후 일봉의 흔한 문제를 배열 단위로 한 번에 보정
+  (중복 날짜, NaN 봉, OHLC 불일치, 튀는 값, 거래 없는 날, 갱신 안 된 마지막 봉)
+- 종목별 품질 리포트 (유니버스 전체 점검용)
+"""
+
+import numpy as np
+import pandas as pd
+
+PRICE_COLUMNS = ("Open", "High", "Low", "Close")
+
+# 결측 보정 방식
+#   "ffill": 전날 종가로 채움 (거래량 0)
+#   "drop": 결측 봉 제거
+FILL_POLICIES = ("ffill", "drop")
+
+# 튀는 값 판정: 직전/직후 봉 대비 반대 방향으로 이만큼 이상 움직인 봉 (로그수익률)
+SPIKE_MIN_RETURN = 0.25
+# 종목 평소 변동성(MAD 기준 표준편차) 대비 배수
+SPIKE_Z = 8.0
+
+
+def _empty_report(symbol, rows):
+    return {
+        "symbol": symbol,
+        "rows_in": rows,
+        "rows_out": rows,
+        "duplicates": 0,
+        "missing_filled": 0,
+        "partial_filled": 0,
+        "dropped": 0,
+        "ohlc_fixed": 0,
+        "outliers_clipped": 0,
+        "zero_volume": 0,
+        "volume_fixed": 0,
+        "stale_last_row": False,
+    }
+
+
+def _spike_mask(close):
+    """직전/직후 봉과 반대 방향으로 크게 튄 봉 (단일 봉 오류)"""
+    n = len(close)
+    mask = np.zeros(n, dtype=bool)
+    if n < 3:
+        return mask
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = np.diff(np.log(close))
+    valid = r[np.isfinite(r)]
+    if len(valid) == 0:
+        return mask
+
+    mad = np.median(np.abs(valid - np.median(valid)))
+    threshold = max(SPIKE_MIN_RETURN, SPIKE_Z * 1.4826 * mad)
+
+    into, out = r[:-1], r[1:]
+    spike = (np.abs(into) > threshold) & (np.abs(out) > threshold) & (np.sign(into) != np.sign(out))
+    mask[1:-1] = spike
+    return mask
+
+
+def repair_bars(df, symbol=None, fill="ffill"):
+    """
+    일봉 검사/보정
+
+    Args:
+        df: OHLCV DataFrame
+        symbol: 리포트용 심볼
+        fill: 결측 봉 처리 ("ffill" 또는 "drop")
+
+    Returns:
+        (보정된 DataFrame, 품질 리포트 dict)
+    """
+    if fill not in FILL_POLICIES:
+        raise ValueError(f"지원하지 않는 결측 처리: {fill} (가능: {', '.join(FILL_POLICIES)})")
+    if df is None or len(df) == 0:
+        return df, _empty_report(symbol, 0)
+
+    report = _empty_report(symbol, len(df))
+
+    # 1. 중복 날짜 (나중 값 유지) + 정렬
+    dup = df.index.duplicated(keep="last")
+    report["duplicates"] = int(dup.sum())
+    if dup.any():
+        df = df[~dup]
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index()
+
+    prices = np.column_stack([df[col].to_numpy(dtype=np.float64) for col in PRICE_COLUMNS])
+    has_volume = "Volume" in df.columns
+    volume = df["Volume"].to_numpy(dtype=np.float64, copy=True) if has_volume else np.zeros(len(df))
+    keep = np.ones(len(df), dtype=bool)
+    filled = np.zeros(len(df), dtype=bool)
+
+    # 2. 결측: 종가 없는 봉은 정책대로, 일부만 빈 가격은 종가로 채움
+    close = prices[:, 3]
+    missing = np.isnan(close)
+    if missing.any():
+        if fill == "ffill":
+            # 직전 유효 종가 위치 (앞쪽에 유효값이 없으면 제거)
+            pos = np.where(~missing, np.arange(len(close)), -1)
+            np.maximum.accumulate(pos, out=pos)
+            lead = pos < 0
+            filled = missing & ~lead
+            prices[filled] = close[pos[filled]][:, None]
+            volume[filled] = 0.0
+            keep &= ~lead
+            report["missing_filled"] = int(filled.sum())
+        else:
+            keep &= ~missing
+    partial = np.isnan(prices) & ~np.isnan(prices[:, [3]])
+    if partial.any():
+        prices = np.where(partial, prices[:, [3]], prices)
+        report["partial_filled"] = int((partial.any(axis=1) & keep).sum())
+    bad_volume = ~(np.isfinite(volume) & (volume >= 0))
+    if bad_volume.any():
+        volume[bad_volume] = 0.0
+        report["volume_fixed"] = int((bad_volume & keep).sum())
+
+    # 3. 단일 봉 튐 → 전후 봉 범위로 자르기
+    spike = _spike_mask(prices[:, 3]) & keep
+    if spike.any():
+        idx = np.flatnonzero(spike)
+        lo = np.minimum(prices[idx - 1, 2], prices[idx + 1, 2])
+        hi = np.maximum(prices[idx - 1, 1], prices[idx + 1, 1])
+        prices[idx] = np.clip(prices[idx], lo[:, None], hi[:, None])
+        report["outliers_clipped"] = int(len(idx))
+
+    # 4. OHLC 일관성 (High는 최대, Low는 최소)
+    high = prices.max(axis=1)
+    low = prices.min(axis=1)
+    fixed = (prices[:, 1] != high) | (prices[:, 2] != low)
+    report["ohlc_fixed"] = int((fixed & keep).sum())
+    prices[:, 1] = high
+    prices[:, 2] = low
+
+    # 5. 거래 없는 날: 거래량이 있는 종목에서 거래량 0 + 가격 변화 없는 봉은 휴장일로 보고 제거
+    #    (지수처럼 거래량이 아예 없는 종목은 그대로 둠)
+    if has_volume and (volume > 0).any():
+        zero = (volume == 0) & ~filled
+        report["zero_volume"] = int((zero & keep).sum())
+        prev_close = np.concatenate(([np.nan], prices[:-1, 3]))
+        flat = (prices[:, 0] == prices[:, 3]) & (prices[:, 1] == prices[:, 2]) & (prices[:, 3] == prev_close)
+        keep &= ~(zero & flat)
+
+    # 6. 마지막 봉이 직전 봉과 완전히 같으면 갱신 안 된 봉으로 보고 제거
+    last = np.flatnonzero(keep)
+    if len(last) >= 2:
+        a, b = last[-1], last[-2]
+        if np.array_equal(prices[a], prices[b]) and volume[a] == volume[b]:
+            keep[a] = False
+            report["stale_last_row"] = True
+
+    if keep.all() and not has_issues(report):
+        # 보정할 것이 없으면 복사 없이 그대로 반환
+        return df, report
+
+    out = df.copy() if keep.all() else df[keep].copy()
+    for i, col in enumerate(PRICE_COLUMNS):
+        if col in out.columns:
+            out[col] = prices[keep, i]
+    if has_volume:
+        out["Volume"] = volume[keep]
+
+    report["rows_out"] = len(out)
+    report["dropped"] = report["rows_in"] - report["duplicates"] - len(out)
+    return out, report
+
+
+def has_issues(report):
+    """리포트에 보정 내역이 있는지"""
+    return bool(
+        report["duplicates"] or report["missing_filled"] or report["partial_filled"] or report["dropped"]
+        or report["ohlc_fixed"] or report["outliers_clipped"] or report["volume_fixed"]
+        or report["stale_last_row"]
+    )
+
+
+def check_universe(frames, fill="ffill"):
+    """
+    여러 종목 일괄 검사/보정
+
+    Args:
+        frames: {심볼: DataFrame}
+
+    Returns:
+        (보정된 {심볼: DataFrame}, {심볼: 품질 리포트})
+    """
+    repaired, reports = {}, {}
+    for symbol, df in frames.items():
+        repaired[symbol], reports[symbol] = repair_bars(df, symbol, fill=fill)
+    return repaired, reports
+
+
+def quality_table(reports):
+    """품질 리포트 → DataFrame (보정 내역 있는 종목만)"""
+    rows = [r for r in reports.values() if has_issues(r)]
+    if not rows:
+        return pd.DataFrame(columns=list(_empty_report(None, 0)))
+    return pd.DataFrame(rows).set_index("symbol")
@@ -0,0 +1,195 @@
+"""
+야후 요청 실행기 모듈
+- 동시 요청 수 제한 (스레드 풀)
+- 토큰 버킷 속도 제한 (야후 차단 방지)
+- 지수 백오프 + 지터 재시도
+- 같은 요청 합치기 (동시/반복 요청은 한 번만 실행)
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+# 기본 설정
+MAX_WORKERS = 4       # 동시 요청 수
+RATE_PER_SEC = 2.0    # 초당 요청 수
+BURST = 4             # 순간 허용 요청 수
+MAX_RETRIES = 3       # 재시도 횟수
+BACKOFF_BASE = 0.5    # 첫 재시도 대기 (초)
+BACKOFF_MAX = 8.0     # 최대 재시도 대기 (초)
+COALESCE_TTL = 60.0   # 완료된 요청 결과 재사용 시간 (초)
+
+
+class TokenBucket:
+    """토큰 버킷 속도 제한기 (스레드 안전)"""
+
+    def __init__(self, rate=RATE_PER_SEC, capacity=BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def acquire(self):
+        """토큰 하나를 얻을 때까지 대기"""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def backoff_delay(attempt, base=BACKOFF_BASE, max_delay=BACKOFF_MAX):
+    """지수 백오프 + 풀 지터 대기 시간"""
+    return random.uniform(0, min(max_delay, base * (2 ** attempt)))
+
+
+class FetchExecutor:
+    """
+    요청 실행기
+    - call(): 현재 스레드에서 속도 제한 + 재시도로 실행
+    - submit(): 스레드 풀에 제출하고 Future 반환
+    """
+
+    def __init__(self, max_workers=MAX_WORKERS, rate=RATE_PER_SEC, burst=BURST,
+                 retries=MAX_RETRIES, backoff_base=BACKOFF_BASE, backoff_max=BACKOFF_MAX):
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.limiter = TokenBucket(rate, burst)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fetch")
+
+    def call(self, fn, *args, **kwargs):
+        """속도 제한 + 재시도로 실행 (마지막 시도까지 실패하면 예외 전달)"""
+        for attempt in range(self.retries + 1):
+            self.limiter.acquire()
+            try:
+                return fn(*args, **kwargs)
+            except Exception:
+                if attempt >= self.retries:
+                    raise
+                time.sleep(backoff_delay(attempt, self.backoff_base, self.backoff_max))
+
+    def submit(self, fn, *args, **kwargs):
+        """스레드 풀에 제출 (fn 내부의 요청은 call()로 제한됨)"""
+        return self._pool.submit(fn, *args, **kwargs)
+
+    def submit_many(self, fn, items, **kwargs):
+        """
+        여러 건 제출
+
+        Returns:
+            dict: {item: Future}
+        """
+        return {item: self.submit(fn, item, **kwargs) for item in dict.fromkeys(items)}
+
+    def shutdown(self, wait=True):
+        self._pool.shutdown(wait=wait)
+
+
+class RequestCoalescer:
+    """
+    같은 키의 요청 합치기
+    - 진행 중인 요청이 있으면 그 결과를 같이 기다림
+    - 완료 후 ttl 동안은 같은 결과 재사용 (실패는 재사용하지 않음)
+    """
+
+    def __init__(self, ttl=COALESCE_TTL):
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, fn, *args, **kwargs):
+        """key 요청이 없을 때만 fn(*args, **kwargs) 실행"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                future, done_at = entry
+                if done_at is None or time.monotonic() - done_at <= self.ttl:
+                    self.hits += 1
+                    owner = False
+                else:
+                    entry = None
+            if entry is None:
+                future = Future()
+                self._entries[key] = (future, None)
+                self.misses += 1
+                owner = True
+
+        if not owner:
+            return future.result()
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            # KeyboardInterrupt 등도 진행 중 항목을 지우고 기다리는 쪽에 전달 (안 그러면 영원히 대기)
+            with self._lock:
+                self._entries.pop(key, None)
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._entries[key] = (future, time.monotonic())
+        future.set_result(result)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """프로세스 공용 실행기"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = FetchExecutor()
+        return _executor
+
+
+def configure_executor(**kwargs):
+    """
+    공용 실행기 설정 변경 (기존 실행기는 종료)
+
+    Args:
+        max_workers, rate, burst, retries, backoff_base, backoff_max
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+        _executor = FetchExecutor(**kwargs)
+        return _executor
+
+
+def collect(futures):
+    """
+    Future 결과 모으기 (실패한 항목은 None)
+
+    Args:
+        futures: {key: Future}
+    """
+    results = {}
+    for key, future in futures.items():
+        try:
+            results[key] = future.result()
+        except Exception as e:
+            print(f"[{key}] 요청 실패: {e}")
+            results[key] = None
+    return results
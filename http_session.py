@@ -0,0 +1,175 @@
+"""
+야후 HTTP 세션 모듈
+- 프로세스 공용 세션 하나로 모든 야후 요청 처리 (연결/TLS/쿠키/crumb 재사용)
+- keep-alive, 연결 풀 크기, 호스트별 동시 연결 수 제한
+- 호스트별 연결 재사용 통계
+"""
+
+import threading
+from urllib.parse import urlsplit
+
+try:
+    # yfinance 기본 백엔드 (브라우저 TLS 지문 흉내, 야후 차단 회피)
+    from curl_cffi import CurlInfo, CurlOpt
+    from curl_cffi import requests as _backend
+    HAS_CURL_CFFI = True
+except ImportError:
+    import requests as _backend
+    from requests.adapters import HTTPAdapter
+    HAS_CURL_CFFI = False
+
+# 기본 설정
+POOL_MAXSIZE = 10        # 세션이 유지하는 keep-alive 연결 수 (curl은 스레드별 핸들마다)
+HOST_CONNECTIONS = 4     # 호스트별 동시 연결 수
+KEEPALIVE_IDLE = 60      # TCP keep-alive 첫 probe까지 유휴 시간 (초)
+IMPERSONATE = "chrome"   # curl_cffi 브라우저 흉내
+
+
+class ConnectionStats:
+    """호스트별 요청 수 / 새 연결 수 (스레드 안전)"""
+
+    def __init__(self):
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def record(self, host, new_connections):
+        with self._lock:
+            entry = self._hosts.setdefault(host, {"requests": 0, "connections": 0})
+            entry["requests"] += 1
+            entry["connections"] += new_connections
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: {호스트: {"requests", "connections", "reused", "reuse_rate"}, "total": {...}}
+        """
+        with self._lock:
+            hosts = {host: dict(entry) for host, entry in self._hosts.items()}
+
+        total = {"requests": 0, "connections": 0}
+        for entry in hosts.values():
+            total["requests"] += entry["requests"]
+            total["connections"] += entry["connections"]
+        hosts["total"] = total
+
+        for entry in hosts.values():
+            entry["reused"] = max(entry["requests"] - entry["connections"], 0)
+            entry["reuse_rate"] = entry["reused"] / entry["requests"] if entry["requests"] else 0.0
+        return hosts
+
+    def reset(self):
+        with self._lock:
+            self._hosts.clear()
+
+
+class _HostLimiter:
+    """호스트별 동시 요청 수 제한 (연결 수 상한)"""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self._slots = {}
+        self._lock = threading.Lock()
+
+    def slot(self, host):
+        with self._lock:
+            if host not in self._slots:
+                self._slots[host] = threading.BoundedSemaphore(self.limit)
+            return self._slots[host]
+
+
+if HAS_CURL_CFFI:
+
+    class PooledSession(_backend.Session):
+        """
+        curl_cffi 공용 세션
+        - 스레드마다 curl 핸들(연결 캐시) 하나를 재사용
+        - 새 연결 수는 CURLINFO_NUM_CONNECTS로 집계
+        """
+
+        def __init__(self, pool_maxsize=POOL_MAXSIZE, host_connections=HOST_CONNECTIONS,
+                     keepalive_idle=KEEPALIVE_IDLE, impersonate=IMPERSONATE):
+            super().__init__(
+                impersonate=impersonate,
+                curl_options={
+                    CurlOpt.MAXCONNECTS: pool_maxsize,
+                    CurlOpt.TCP_KEEPALIVE: 1,
+                    CurlOpt.TCP_KEEPIDLE: keepalive_idle,
+                },
+                curl_infos=[CurlInfo.NUM_CONNECTS],
+            )
+            self.pool_maxsize = pool_maxsize
+            self.stats = ConnectionStats()
+            self._hosts = _HostLimiter(host_connections)
+
+        def request(self, method, url, *args, **kwargs):
+            host = urlsplit(url).hostname or ""
+            with self._hosts.slot(host):
+                response = super().request(method, url, *args, **kwargs)
+            self.stats.record(host, int(response.infos.get(CurlInfo.NUM_CONNECTS, 0) or 0))
+            return response
+
+else:
+
+    class PooledSession(_backend.Session):
+        """
+        requests 공용 세션 (curl_cffi 없을 때)
+        - urllib3 호스트별 연결 풀, pool_block으로 호스트별 연결 수 상한
+        - 새 연결 수는 풀의 num_connections 증가분으로 집계
+        """
+
+        def __init__(self, pool_maxsize=POOL_MAXSIZE, host_connections=HOST_CONNECTIONS,
+                     keepalive_idle=KEEPALIVE_IDLE, impersonate=IMPERSONATE):
+            super().__init__()
+            adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=host_connections,
+                                  pool_block=True)
+            self.mount("https://", adapter)
+            self.mount("http://", adapter)
+            self.pool_maxsize = pool_maxsize
+            self.stats = ConnectionStats()
+            self._hosts = _HostLimiter(host_connections)
+            self._seen = {}
+            self._seen_lock = threading.Lock()
+
+        def request(self, method, url, *args, **kwargs):
+            host = urlsplit(url).hostname or ""
+            with self._hosts.slot(host):
+                response = super().request(method, url, *args, **kwargs)
+            pool = self.get_adapter(url).poolmanager.connection_from_url(url)
+            with self._seen_lock:
+                new_connections = pool.num_connections - self._seen.get(host, 0)
+                self._seen[host] = pool.num_connections
+            self.stats.record(host, max(new_connections, 0))
+            return response
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """프로세스 공용 세션"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = PooledSession()
+        return _session
+
+
+def configure_session(**kwargs):
+    """
+    공용 세션 설정 변경 (기존 세션은 닫음)
+
+    Args:
+        pool_maxsize, host_connections, keepalive_idle, impersonate
+    """
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = PooledSession(**kwargs)
+        return _session
+
+
+def session_stats():
+    """공용 세션 연결 재사용 통계 (세션이 없으면 빈 dict)"""
+    return _session.stats.snapshot() if _session is not None else {}
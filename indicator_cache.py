@@ -0,0 +1,178 @@
+"""
+지표 계산 결과 디스크 캐시
+- data/cache/indicators/ 에 지표 배열을 .npy로 저장, 적중 시 메모리 매핑으로 로드
+- 키: 심볼 + 마지막 봉 날짜 + 시세 데이터 해시 + 지표 설정 해시 (컬럼, tail, dtype, 평활 방식)
+  → 같은 날 재실행/리포트 재생성 시 지표 계산 생략, 데이터가 바뀌면 자동으로 새로 계산
+- 오래된 항목은 경과 시간/전체 크기 기준으로 삭제
+"""
+
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+import indicator_graph as graph
+from indicator_graph import BASE_COLUMNS
+from indicators import INDICATOR_COLUMNS, calculate_all_indicators
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+INDICATOR_CACHE_DIR = os.path.join(BASE_DIR, "data", "cache", "indicators")
+
+# 지표 정의가 바뀌면 올려서 기존 캐시 무효화
+CACHE_VERSION = 1
+
+# 삭제 기준
+MAX_AGE = 7 * 24 * 3600
+MAX_CACHE_BYTES = 256 * 1024 * 1024
+
+
+def _safe_symbol(symbol):
+    return "".join(c if c.isalnum() or c in "-." else "_" for c in symbol.upper())
+
+
+def data_hash(df):
+    """시세 데이터 해시 (날짜 + OHLCV 값)"""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(np.ascontiguousarray(df.index.asi8 if hasattr(df.index, "asi8") else df.index.to_numpy()).tobytes())
+    for col in BASE_COLUMNS:
+        h.update(np.ascontiguousarray(df[col].to_numpy(dtype=np.float64)).tobytes())
+    return h.hexdigest()
+
+
+def params_hash(columns, tail=None, dtype=None):
+    """지표 설정 해시"""
+    params = {
+        "version": CACHE_VERSION,
+        "columns": list(columns),
+        "tail": tail,
+        "dtype": np.dtype(dtype or graph.get_dtype()).name,
+        "smoothing": graph.get_smoothing(),
+    }
+    return hashlib.blake2b(json.dumps(params).encode(), digest_size=8).hexdigest()
+
+
+def cache_path(symbol, df, columns, tail=None, dtype=None):
+    """캐시 파일 경로 (키 = 심볼, 마지막 봉 날짜, 데이터 해시, 설정 해시)"""
+    last = df.index[-1].strftime("%Y%m%d") if len(df) else "empty"
+    key = f"{data_hash(df)[:16]}{params_hash(columns, tail, dtype)}"
+    return os.path.join(INDICATOR_CACHE_DIR, f"{_safe_symbol(symbol)}_{last}_{key}.npy")
+
+
+def load_cached(path, df, columns, tail=None):
+    """
+    캐시 로드 (메모리 매핑)
+
+    Returns:
+        calculate_all_indicators(df, tail, columns)와 같은 형태의 DataFrame 또는 None (없음/손상)
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        values = np.load(path, mmap_mode="r")
+    except Exception as e:
+        print(f"지표 캐시 읽기 실패 ({os.path.basename(path)}): {e}")
+        return None
+
+    n = len(df) if tail is None else min(tail, len(df))
+    if values.shape != (len(columns), n):
+        return None
+
+    # 최근 사용 시각 갱신 (크기 기준 삭제 시 오래 안 쓴 것부터)
+    os.utime(path)
+    out = {col: df[col].to_numpy()[len(df) - n:] for col in df.columns}
+    out.update(zip(columns, values))
+    return pd.DataFrame(out, index=df.index[len(df) - n:])
+
+
+def save_cached(path, frame, columns):
+    """지표 컬럼 저장 (같은 심볼의 이전 봉 기준 캐시는 삭제)"""
+    try:
+        os.makedirs(INDICATOR_CACHE_DIR, exist_ok=True)
+        values = np.stack([frame[col].to_numpy() for col in columns])
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.save(f, values)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        print(f"지표 캐시 저장 실패 ({os.path.basename(path)}): {e}")
+        return None
+
+    symbol, last = os.path.basename(path).rsplit("_", 2)[:2]
+    for name in os.listdir(INDICATOR_CACHE_DIR):
+        parts = name.rsplit("_", 2)
+        if name.endswith(".npy") and len(parts) == 3 and parts[0] == symbol and parts[1] < last:
+            os.remove(os.path.join(INDICATOR_CACHE_DIR, name))
+    return path
+
+
+def cached_indicators(symbol, df, columns=None, tail=None, dtype=None):
+    """
+    캐시 적중 시 로드, 아니면 calculate_all_indicators로 계산 후 저장
+
+    Args:
+        symbol: 심볼
+        df: OHLCV DataFrame (보정 후)
+        columns, tail, dtype: calculate_all_indicators와 같음
+    """
+    columns = INDICATOR_COLUMNS if columns is None else list(columns)
+    path = cache_path(symbol, df, columns, tail, dtype)
+    cached = load_cached(path, df, columns, tail)
+    if cached is not None:
+        return cached
+
+    frame = calculate_all_indicators(df, tail=tail, columns=columns, dtype=dtype)
+    save_cached(path, frame, columns)
+    return frame
+
+
+def evict(max_age=MAX_AGE, max_bytes=MAX_CACHE_BYTES):
+    """
+    오래된 캐시 삭제 (max_age초 넘게 안 쓴 항목, 전체 크기가 max_bytes를 넘으면 오래 안 쓴 순서로)
+
+    Returns:
+        삭제한 파일 수
+    """
+    if not os.path.isdir(INDICATOR_CACHE_DIR):
+        return 0
+
+    entries = []
+    for name in os.listdir(INDICATOR_CACHE_DIR):
+        path = os.path.join(INDICATOR_CACHE_DIR, name)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+    entries.sort()
+
+    now = time.time()
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for mtime, size, path in entries:
+        if now - mtime <= max_age and total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    return removed
+
+
+def invalidate(symbol=None):
+    """
+    캐시 삭제
+
+    Args:
+        symbol: 삭제할 심볼 (None이면 전체)
+    """
+    if not os.path.isdir(INDICATOR_CACHE_DIR):
+        return
+    prefix = f"{_safe_symbol(symbol)}_" if symbol is not None else ""
+    for name in os.listdir(INDICATOR_CACHE_DIR):
+        if name.startswith(prefix) and name.endswith((".npy", ".tmp")):
+            os.remove(os.path.join(INDICATOR_CACHE_DIR, name))
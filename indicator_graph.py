@@ -0,0 +1,460 @@
+"""
+지표 계산 그래프 모듈
+- 지표마다 입력(다른 지표/중간값)을 선언하고, 요청한 컬럼에 필요한 노드만 한 번씩 계산
+- 공유 중간값: 전일 종가, 전형적 가격(TP), 20일 거래량 합, 9/26/52일 고저 등
+  (BB_Middle = MA20, Volume_MA20과 VWAP_20이 같은 거래량 합 사용)
+- 노드별 lookback으로 tail 계산에 필요한 워밍업 구간을 자동으로 산출
+- 1차원(종목 하나)과 (시간 × 종목) 2차원 배열 모두 같은 코드로 계산
+- dtype 정책: 기본 float64, float32로 바꾸면 입력/출력/중간 배열을 float32로 계산
+  (누적합, 이동 분산, 재귀 필터의 누적은 float64로 유지)
+
+이름이 _로 시작하는 노드는 중간값 (요청하면 꺼낼 수 있지만 기본 출력에는 없음)
+"""
+
+import numpy as np
+import pandas as pd
+
+from rolling_extrema import rolling_extrema
+
+BASE_COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+
+# RSI/ATR 평활 방식
+#   "wilder": 와일더 평균 (첫 period개 단순평균 후 alpha = 1/period, 증권사 앱/HTS 기본값)
+#   "ema": 지수 평균 (alpha = 2/(period+1))
+#   "sma": 단순 이동평균 (이전 방식)
+SMOOTHING_METHODS = ("wilder", "ema", "sma")
+DEFAULT_SMOOTHING = "wilder"
+_smoothing = DEFAULT_SMOOTHING
+
+# 계산 dtype (set_dtype()으로 변경, compute(dtype=...)로 호출별 지정)
+DEFAULT_DTYPE = np.float64
+_dtype = DEFAULT_DTYPE
+
+# float32 계산 허용 오차 (컬럼 최대 절댓값 대비, compare_precision 기준)
+FLOAT32_TOLERANCE = 1e-4
+
+# 재귀 필터 블록 크기 상한 (블록 안 감쇠 배율 e^x가 float64 범위를 넘지 않도록)
+_FILTER_MAX_EXP = 300.0
+
+
+# === 배열 연산 (0번 축 = 시간, 1차원/2차원 공용) ===
+
+def shift(x, periods):
+    """시간축 이동 (pandas shift와 같음)"""
+    out = np.full(x.shape, np.nan, dtype=x.dtype)
+    if periods > 0:
+        out[periods:] = x[:-periods]
+    elif periods < 0:
+        out[:periods] = x[-periods:]
+    else:
+        out[:] = x
+    return out
+
+
+def _first_valid(x):
+    """열별 첫 유효값 (없으면 0)"""
+    valid = ~np.isnan(x)
+    first = np.argmax(valid, axis=0)
+    base = x[first, np.arange(x.shape[1])] if x.ndim == 2 else x[first]
+    return np.where(valid.any(axis=0), base, 0.0)
+
+
+def rolling_sum(x, window):
+    """
+    이동 합계 (창 안에 NaN이 있거나 창이 안 차면 NaN, pandas rolling과 같음)
+    누적은 입력 dtype과 관계없이 float64
+    """
+    out = np.full(x.shape, np.nan, dtype=x.dtype)
+    if window > len(x):
+        return out
+
+    valid = ~np.isnan(x)
+    # 열마다 첫 유효값을 빼고 누적 → 큰 값의 누적합 자릿수 손실 감소
+    base = _first_valid(x)
+    cs = np.cumsum(np.where(valid, x - base, 0.0), axis=0, dtype=np.float64)
+    cnt = np.cumsum(valid, axis=0)
+
+    total = cs[window - 1:].copy()
+    total[1:] -= cs[:-window]
+    count = cnt[window - 1:].copy()
+    count[1:] -= cnt[:-window]
+    out[window - 1:] = np.where(count == window, total + base * window, np.nan)
+    return out
+
+
+def rolling_mean(x, window):
+    return rolling_sum(x, window) / window
+
+
+def rolling_std(x, window):
+    """이동 표본 표준편차 (ddof=1, 제곱합은 float64로 계산)"""
+    d = x.astype(np.float64) - _first_valid(x)
+    s1 = rolling_sum(d, window)
+    s2 = rolling_sum(d * d, window)
+    var = (s2 - s1 * s1 / window) / (window - 1)
+    return np.sqrt(np.maximum(var, 0.0)).astype(x.dtype, copy=False)
+
+
+def ema(x, span):
+    """지수 이동평균 (pandas ewm(span, adjust=False), 열마다 첫 유효값부터 시작)"""
+    frame = pd.DataFrame(x) if x.ndim == 2 else pd.Series(x)
+    return frame.ewm(span=span, adjust=False).mean().to_numpy(dtype=x.dtype)
+
+
+def _first_valid_index(x):
+    """열별 첫 유효값 위치 (없으면 len(x))"""
+    valid = ~np.isnan(x)
+    return np.where(valid.any(axis=0), np.argmax(valid, axis=0), len(x))
+
+
+def recursive_filter(x, alpha, start):
+    """
+    1차 재귀 필터 y[t] = alpha * x[t] + (1 - alpha) * y[t-1]
+    열마다 y[start] = x[start]에서 시작 (이전은 NaN), start 이후 x에 NaN이 없어야 함
+    alpha, start는 스칼라 또는 열별 배열 (여러 기간을 열로 나란히 놓고 한 번에 계산 가능)
+
+    블록 단위 닫힌 식으로 시간 루프 없이 (시간 × 종목) 전체를 한 번에 계산
+      y[b+k] = (1-alpha)^k * (y[b] + Σ_{j<=k} alpha * x[b+j] * (1-alpha)^-j)
+    (누적은 float64, 결과는 입력 dtype)
+    """
+    dtype = x.dtype
+    x = x.astype(np.float64, copy=False)
+    x2 = x if x.ndim == 2 else x[:, None]
+    rows, cols = x2.shape
+    start = np.broadcast_to(np.asarray(start), (cols,))
+    live = start < rows
+    if rows == 0 or not live.any():
+        return np.full(x.shape, np.nan, dtype=dtype)
+
+    s = np.minimum(start, rows - 1)
+    state = x2[s, np.arange(cols)]
+    # 시작 전 구간은 시작값으로 채워서 상태가 그대로 유지되게 함
+    before = np.arange(rows)[:, None] < s
+    out = np.where(before, state, x2)
+
+    # alpha는 스칼라 또는 열별 배열 (alpha = 1인 열은 y = x)
+    alpha = np.broadcast_to(np.asarray(alpha, dtype=np.float64), (cols,))
+    passthrough = alpha >= 1
+    decay = np.where(passthrough, 1.0, 1.0 - alpha)
+    # 블록 크기는 가장 빨리 감쇠하는 열 기준 (decay ** -k 오버플로 방지)
+    rate = (-np.log(decay)).max()
+    block = rows if rate == 0 else max(1, int(_FILTER_MAX_EXP / rate))
+    for b in range(0, rows, block):
+        chunk = out[b:b + block]
+        growth = decay ** -np.arange(1, len(chunk) + 1, dtype=np.float64)[:, None]
+        filtered = (state + np.cumsum(alpha * chunk * growth, axis=0)) / growth
+        chunk[:] = np.where(passthrough, chunk, filtered) if passthrough.any() else filtered
+        state = chunk[-1]
+
+    out[before | ~live] = np.nan
+    out = out.astype(dtype, copy=False)
+    return out if x.ndim == 2 else out[:, 0]
+
+
+def _smooth_loop(x, period, method):
+    """NaN이 섞인 열용 봉 단위 평활 (NaN 입력은 건너뛰고 직전 값 유지, streaming과 같은 규칙)"""
+    alpha = 1 / period if method == "wilder" else 2 / (period + 1)
+    out = np.full(len(x), np.nan)
+    value, seed = np.nan, []
+    for t, v in enumerate(x.tolist()):
+        if v == v:
+            if method == "wilder" and len(seed) < period:
+                seed.append(v)
+                if len(seed) == period:
+                    value = sum(seed) / period
+            elif value != value:
+                value = v
+            else:
+                value = alpha * v + (1 - alpha) * value
+        out[t] = value
+    return out
+
+
+def smooth(x, period, method=None):
+    """
+    평활 이동평균 (1차원/2차원 공용, 열마다 첫 유효값부터 시작)
+
+    Args:
+        x: 입력 배열
+        period: 기간
+        method: "wilder", "ema", "sma" (None이면 set_smoothing으로 정한 방식)
+    """
+    method = method or _smoothing
+    if method == "sma":
+        return rolling_mean(x, period)
+    if method not in SMOOTHING_METHODS:
+        raise ValueError(f"지원하지 않는 평활 방식: {method} (가능: {', '.join(SMOOTHING_METHODS)})")
+
+    x2 = x if x.ndim == 2 else x[:, None]
+    first = _first_valid_index(x2)
+    if method == "ema":
+        start, alpha, seeded = first, 2 / (period + 1), x2
+    else:
+        # 와일더: 첫 period개 단순평균을 시작값으로
+        start, alpha = first + period - 1, 1 / period
+        seeded = x2.copy()
+        cols = np.flatnonzero(start < len(x2))
+        window = first[cols] + np.arange(period)[:, None]
+        seeded[start[cols], cols] = x2[window, cols].mean(axis=0)
+    out = recursive_filter(seeded, alpha, start)
+
+    # 시작 이후 NaN이 있는 열만 봉 단위로 다시 계산
+    gaps = np.isnan(x2) & (np.arange(len(x2))[:, None] >= first)
+    for j in np.flatnonzero(gaps.any(axis=0)):
+        out[:, j] = _smooth_loop(x2[:, j], period, method)
+    return out if x.ndim == 2 else out[:, 0]
+
+
+def _divide(a, b):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return a / b
+
+
+# === 노드 정의 ===
+
+class Node:
+    """
+    지표 노드
+
+    Attributes:
+        name: 컬럼명
+        inputs: 입력 노드 이름
+        fn: fn(*입력 배열) → 배열
+        lookback: 현재 봉 값을 내는 데 필요한 입력의 과거 봉 수
+        recursive: 첫 봉부터 누적되는 값 (EMA 등, 잘라서 계산하면 값이 달라짐)
+    """
+
+    __slots__ = ("name", "inputs", "fn", "lookback", "recursive")
+
+    def __init__(self, name, inputs, fn, lookback=0, recursive=False):
+        self.name = name
+        self.inputs = tuple(inputs)
+        self.fn = fn
+        self.lookback = lookback
+        self.recursive = recursive
+
+
+NODES = {}
+
+
+def define(name, inputs, fn, lookback=0, recursive=False):
+    """노드 등록 (같은 이름이면 교체)"""
+    NODES[name] = Node(name, inputs, fn, lookback, recursive)
+
+
+def _define_defaults():
+    # 공유 중간값
+    define("_prev_close", ["Close"], lambda c: shift(c, 1), lookback=1)
+    define("_typical_price", ["High", "Low", "Close"], lambda h, l, c: (h + l + c) / 3)
+    define("_volume_sum20", ["Volume"], lambda v: rolling_sum(v, 20), lookback=19)
+    define("_close_std20", ["Close"], lambda c: rolling_std(c, 20), lookback=19)
+    define("_highs", ["High"], lambda h: rolling_extrema(h, (9, 26, 52), "max"), lookback=51)
+    define("_lows", ["Low"], lambda l: rolling_extrema(l, (9, 26, 52), "min"), lookback=51)
+
+    # 이동평균
+    for w in (5, 20, 60):
+        define(f"MA{w}", ["Close"], lambda c, w=w: rolling_mean(c, w), lookback=w - 1)
+
+    # 일목균형표
+    define("Tenkan", ["_highs", "_lows"], lambda h, l: (h[9] + l[9]) / 2)
+    define("Kijun", ["_highs", "_lows"], lambda h, l: (h[26] + l[26]) / 2)
+    define("SpanA", ["Tenkan", "Kijun"], lambda t, k: shift((t + k) / 2, 26), lookback=26)
+    define("SpanB", ["_highs", "_lows"], lambda h, l: shift((h[52] + l[52]) / 2, 26), lookback=26)
+    define("Chikou", ["Close"], lambda c: shift(c, -26))
+
+    _define_smoothed(DEFAULT_SMOOTHING)
+
+    # MACD
+    define("EMA12", ["Close"], lambda c: ema(c, 12), recursive=True)
+    define("EMA26", ["Close"], lambda c: ema(c, 26), recursive=True)
+    define("MACD", ["EMA12", "EMA26"], lambda a, b: a - b)
+    define("MACD_Signal", ["MACD"], lambda m: ema(m, 9), recursive=True)
+    define("MACD_Hist", ["MACD", "MACD_Signal"], lambda m, s: m - s)
+
+    # 볼린저밴드 (중심선 = MA20)
+    define("BB_Middle", ["MA20"], lambda m: m)
+    define("BB_Upper", ["BB_Middle", "_close_std20"], lambda m, s: m + s * 2)
+    define("BB_Lower", ["BB_Middle", "_close_std20"], lambda m, s: m - s * 2)
+    define("BB_Width", ["BB_Upper", "BB_Lower", "BB_Middle"], lambda u, l, m: (u - l) / m * 100)
+
+    # 거래량
+    define("Volume_MA20", ["_volume_sum20"], lambda s: s / 20)
+    define("Volume_Ratio", ["Volume", "Volume_MA20"], lambda v, m: _divide(v, m))
+
+    # ATR (전일 종가 공유)
+    define("_true_range", ["High", "Low", "_prev_close"],
+           lambda h, l, p: np.fmax(h - l, np.fmax(np.abs(h - p), np.abs(l - p))))
+    define("ATR_pct", ["ATR", "Close"], lambda a, c: a / c * 100)
+
+    # 빗각 (TP, 20일 거래량 합 공유)
+    define("_tp_volume_sum20", ["_typical_price", "Volume"], lambda tp, v: rolling_sum(tp * v, 20), lookback=19)
+    define("VWAP_20", ["_tp_volume_sum20", "_volume_sum20"], lambda tpv, v: _divide(tpv, v))
+    define("CSI", ["Close", "VWAP_20"], lambda c, vwap: (c - vwap) / vwap * 100)
+
+
+def _define_smoothed(method):
+    """RSI/ATR 노드 (평활 방식별)"""
+    sma = method == "sma"
+    lookback = 13 if sma else 0
+
+    if sma:
+        # 패딩 칸은 NaN, 첫 봉의 변화량은 0으로 계산 → pandas where와 같음
+        define("_gain", ["Close", "_prev_close"],
+               lambda c, p: np.where(np.isnan(c), np.nan, np.where(c - p > 0, c - p, 0.0)))
+        define("_loss", ["Close", "_prev_close"],
+               lambda c, p: np.where(np.isnan(c), np.nan, np.where(c - p < 0, p - c, 0.0)))
+    else:
+        # 첫 봉(전일 종가 없음)은 제외하고 평활 시작
+        define("_gain", ["Close", "_prev_close"], lambda c, p: np.maximum(c - p, 0.0))
+        define("_loss", ["Close", "_prev_close"], lambda c, p: np.maximum(p - c, 0.0))
+    define("_avg_gain", ["_gain"], lambda g: smooth(g, 14, method), lookback, not sma)
+    define("_avg_loss", ["_loss"], lambda l: smooth(l, 14, method), lookback, not sma)
+    define("RSI", ["_avg_gain", "_avg_loss"], lambda g, l: 100 - (100 / (1 + _divide(g, l))))
+    define("ATR", ["_true_range"], lambda tr: smooth(tr, 14, method), lookback, not sma)
+
+
+def set_smoothing(method):
+    """
+    RSI/ATR 평활 방식 변경 ("wilder", "ema", "sma")
+    그래프 노드와 smoothing=None인 calculate_rsi/atr, streaming, sweep 기본값에 모두 적용
+    """
+    global _smoothing
+    if method not in SMOOTHING_METHODS:
+        raise ValueError(f"지원하지 않는 평활 방식: {method} (가능: {', '.join(SMOOTHING_METHODS)})")
+    _define_smoothed(method)
+    _smoothing = method
+
+
+def get_smoothing():
+    return _smoothing
+
+
+_define_defaults()
+
+
+# === 그래프 조회 ===
+
+def dependencies(columns):
+    """요청 컬럼에 필요한 노드 전체 (계산 순서)"""
+    order, seen = [], set()
+
+    def visit(name):
+        if name in seen or name in BASE_COLUMNS:
+            return
+        if name not in NODES:
+            raise KeyError(f"알 수 없는 지표: {name}")
+        seen.add(name)
+        for dep in NODES[name].inputs:
+            visit(dep)
+        order.append(name)
+
+    for col in columns:
+        visit(col)
+    return order
+
+
+def warmup(name):
+    """name의 마지막 값을 내는 데 필요한 과거 봉 수 (입력 경로의 lookback 합 중 최대)"""
+    if name in BASE_COLUMNS:
+        return 0
+    node = NODES[name]
+    return node.lookback + max((warmup(dep) for dep in node.inputs), default=0)
+
+
+def is_recursive(name):
+    """name 계산 경로에 재귀 노드가 있는지 (있으면 전체 이력으로 계산해야 함)"""
+    if name in BASE_COLUMNS:
+        return False
+    node = NODES[name]
+    return node.recursive or any(is_recursive(dep) for dep in node.inputs)
+
+
+def _evaluate(base, columns, cache=None):
+    values = dict(base) if cache is None else cache
+    for name in dependencies(columns):
+        if name not in values:
+            node = NODES[name]
+            values[name] = node.fn(*(values[dep] for dep in node.inputs))
+    return values
+
+
+def set_dtype(dtype):
+    """계산 dtype 정책 변경 (np.float64 또는 np.float32)"""
+    global _dtype
+    dtype = np.dtype(dtype)
+    if dtype not in (np.float64, np.float32):
+        raise ValueError(f"지원하지 않는 dtype: {dtype} (가능: float64, float32)")
+    _dtype = dtype.type
+
+
+def get_dtype():
+    return _dtype
+
+
+def compute(base, columns, tail=None, dtype=None):
+    """
+    요청한 컬럼만 계산
+
+    Args:
+        base: {"Open", "High", "Low", "Close", "Volume": 배열} (1차원 또는 (시간 × 종목))
+        columns: 요청 컬럼 리스트
+        tail: 마지막 tail개 봉만 필요할 때
+              - 재귀 노드가 없는 컬럼은 (tail + 워밍업) 구간만 잘라서 계산
+              - 재귀 노드(EMA 등)가 있는 컬럼은 전체 이력으로 계산 후 잘라냄
+        dtype: 계산 dtype (None이면 set_dtype() 정책)
+
+    Returns:
+        dict: {컬럼: 배열} (tail이면 마지막 tail개 봉)
+    """
+    dtype = dtype or _dtype
+    base = {k: np.asarray(v, dtype=dtype) for k, v in base.items()}
+
+    if tail is None:
+        values = _evaluate(base, columns)
+        return {col: values[col] for col in columns}
+
+    full_cols = [c for c in columns if is_recursive(c)]
+    window_cols = [c for c in columns if c not in full_cols]
+    length = len(base["Close"])
+    result = {}
+
+    if window_cols:
+        size = tail + max(warmup(c) for c in window_cols)
+        start = max(length - size, 0)
+        sliced = {k: v[start:] for k, v in base.items()}
+        values = _evaluate(sliced, window_cols)
+        result.update({c: values[c][-tail:] for c in window_cols})
+    if full_cols:
+        values = _evaluate(base, full_cols)
+        result.update({c: values[c][-tail:] for c in full_cols})
+
+    return {col: result[col] for col in columns}
+
+
+def compare_precision(base, columns, dtype=np.float32, tolerance=FLOAT32_TOLERANCE):
+    """
+    dtype 계산 결과와 float64 결과 비교 (정밀도 모드 검증용)
+
+    Args:
+        base: compute()와 같은 입력
+        columns: 비교할 컬럼
+        dtype: 비교할 dtype
+        tolerance: 허용 오차 (컬럼 최대 절댓값 대비)
+
+    Returns:
+        (ok, {컬럼: 최대 상대 오차})
+        NaN 위치가 다르면 그 컬럼 오차는 inf
+    """
+    reference = compute(base, columns, dtype=np.float64)
+    reduced = compute(base, columns, dtype=dtype)
+    errors = {}
+    for col in columns:
+        ref, val = reference[col], reduced[col].astype(np.float64)
+        if not np.array_equal(np.isnan(ref), np.isnan(val)):
+            errors[col] = np.inf
+            continue
+        valid = np.isfinite(ref) & np.isfinite(val)
+        scale = np.abs(ref[valid]).max() if valid.any() else 0.0
+        diff = np.abs(ref[valid] - val[valid]).max() if valid.any() else 0.0
+        errors[col] = float(diff / scale) if scale > 0 else float(diff)
+    return all(e <= tolerance for e in errors.values()), errors
@@ -0,0 +1,115 @@
+"""
+지표 계산 결과 모듈
+- 입력 OHLCV와 분리된 (컬럼 × 봉) 버퍼에 지표를 기록 (입력 DataFrame은 수정하지 않음)
+- 컬럼 추가 = 미리 할당한 버퍼의 한 행에 복사 (DataFrame 컬럼 삽입/블록 통합 없음)
+- 기간 전체에 같은 값인 지표(HVN 가격 등)는 열로 늘리지 않고 스칼라로 보관
+- DataFrame이 필요할 때만 to_frame()으로 한 번에 생성
+"""
+
+import numpy as np
+import pandas as pd
+
+from ohlcv import as_frame
+
+# 기본 버퍼 크기 (지표 컬럼 수, 부족하면 두 배로 늘림)
+DEFAULT_CAPACITY = 24
+
+
+class IndicatorResult:
+    """
+    지표 계산 결과
+
+    Attributes:
+        base: 입력 OHLCV DataFrame (읽기 전용으로 참조)
+        columns: 지표 컬럼명 (추가 순서)
+        scalars: {이름: 값} 기간 전체에 하나인 지표
+    """
+
+    __slots__ = ("base", "columns", "scalars", "_buffer", "_rows", "_base_values")
+
+    def __init__(self, base, capacity=DEFAULT_CAPACITY, dtype=np.float64):
+        self.base = base
+        self.columns = []
+        self.scalars = {}
+        self._buffer = np.empty((max(capacity, 1), len(base)), dtype=dtype)
+        self._rows = {}
+        self._base_values = {}
+
+    @property
+    def index(self):
+        return self.base.index
+
+    @property
+    def dtype(self):
+        return self._buffer.dtype.type
+
+    def __len__(self):
+        return len(self.base)
+
+    def __contains__(self, name):
+        return name in self._rows or name in self.base.columns or name in self.scalars
+
+    def __getitem__(self, name):
+        """지표 컬럼(버퍼 view) 또는 입력 컬럼 (버퍼 dtype 배열)"""
+        row = self._rows.get(name)
+        if row is not None:
+            return self._buffer[row]
+        if name in self.scalars:
+            return self.scalars[name]
+        values = self._base_values.get(name)
+        if values is None:
+            values = self.base[name].to_numpy(dtype=self._buffer.dtype)
+            self._base_values[name] = values
+        return values
+
+    def __setitem__(self, name, values):
+        """지표 컬럼 기록 (같은 이름이면 덮어씀)"""
+        row = self._rows.get(name)
+        if row is None:
+            row = len(self.columns)
+            if row == len(self._buffer):
+                grown = np.empty((row * 2, self._buffer.shape[1]), dtype=self._buffer.dtype)
+                grown[:row] = self._buffer
+                self._buffer = grown
+            self._rows[name] = row
+            self.columns.append(name)
+        self._buffer[row] = values
+
+    def get(self, name, default=None):
+        return self[name] if name in self else default
+
+    def set_scalar(self, name, value):
+        self.scalars[name] = value
+
+    def latest(self, i=-1):
+        """i번째 봉의 입력/지표/스칼라 값 dict (기본 마지막 봉)"""
+        values = self.base.iloc[i].to_dict()
+        values.update({name: self._buffer[row, i].item() for name, row in self._rows.items()})
+        values.update(self.scalars)
+        return values
+
+    def to_frame(self, columns=None, include_base=True):
+        """
+        DataFrame으로 변환 (지표 컬럼은 블록 하나로 한 번에 생성, 스칼라 제외)
+
+        Args:
+            columns: 포함할 지표 컬럼 (None이면 전체)
+            include_base: 입력 OHLCV 컬럼 포함 여부
+        """
+        columns = self.columns if columns is None else list(columns)
+        rows = [self._rows[c] for c in columns]
+        indicators = pd.DataFrame(self._buffer[rows].T, index=self.base.index, columns=columns)
+        if not include_base:
+            return indicators
+        base = self.base.drop(columns=[c for c in columns if c in self.base.columns])
+        return pd.concat([base, indicators], axis=1)
+
+    def __repr__(self):
+        return f"IndicatorResult({len(self)} bars, {len(self.columns)} columns)"
+
+
+def indicator_result(data, capacity=DEFAULT_CAPACITY, dtype=np.float64):
+    """지표 함수 입력 → IndicatorResult (이미 결과 객체면 그대로 이어서 기록)"""
+    if isinstance(data, IndicatorResult):
+        return data
+    return IndicatorResult(as_frame(data), capacity, dtype)
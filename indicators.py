@@ -2,106 +2,145 @@
 기술적 지표 계산 모듈
 - 이동평균선 (SMA, EMA)
 - 일목균형표 (Ichimoku Cloud)
-- RSI (상대강도지수)
+- RSI (상대강도지수, 와일더 평활)
 - MACD (이동평균수렴확산)
 - 볼린저밴드
-- ATR (변동성)
+- ATR (변동성, 와일더 평활)
 - 거래량 분석
+
+calculate_* 함수는 입력 df를 수정하지 않고 IndicatorResult에 기록해서 반환
+(결과를 다시 넘기면 같은 버퍼에 이어서 기록)
+dtype 인자는 결과 버퍼/계산 dtype (None이면 indicator_graph dtype 정책, set_dtype으로 변경)
 """
 
 import pandas as pd
 import numpy as np
 
+import indicator_graph as graph
+from candle_patterns import scan_candle_patterns
+from indicator_graph import BASE_COLUMNS
+from indicator_result import IndicatorResult, indicator_result
+from ohlcv import as_frame
+from rolling_extrema import rolling_extrema, trailing_extrema
+
+# calculate_all_indicators가 추가하는 컬럼 (순서 동일)
+INDICATOR_COLUMNS = [
+    'MA5', 'MA20', 'MA60', 'Tenkan', 'Kijun', 'SpanA', 'SpanB', 'Chikou', 'RSI',
+    'EMA12', 'EMA26', 'MACD', 'MACD_Signal', 'MACD_Hist',
+    'BB_Middle', 'BB_Upper', 'BB_Lower', 'BB_Width',
+    'Volume_MA20', 'Volume_Ratio', 'ATR', 'ATR_pct',
+]
+
+# tail 모드에서 마지막 봉 앞에 필요한 최소 봉 수 (지표 그래프에서 산출, 선행스팬 B = 77)
+INDICATOR_WARMUP = max(graph.warmup(c) for c in INDICATOR_COLUMNS if not graph.is_recursive(c))
 
-def calculate_ma(df, windows=[5, 20, 60]):
+
+def calculate_ma(df, windows=[5, 20, 60], dtype=None):
     """이동평균선 계산"""
+    out = indicator_result(df, dtype=dtype or graph.get_dtype())
+    close = out['Close']
     for w in windows:
-        df[f'MA{w}'] = df['Close'].rolling(window=w).mean()
-    return df
+        out[f'MA{w}'] = graph.rolling_mean(close, w)
+    return out
 
 
-def calculate_ichimoku(df):
+def calculate_ichimoku(df, dtype=None):
     """일목균형표 계산"""
+    out = indicator_result(df, dtype=dtype or graph.get_dtype())
+    # 9/26/52일 고가/저가를 한 번에 계산
+    highs = rolling_extrema(out['High'], (9, 26, 52), "max")
+    lows = rolling_extrema(out['Low'], (9, 26, 52), "min")
+
     # 전환선 (9일)
-    high_9 = df['High'].rolling(window=9).max()
-    low_9 = df['Low'].rolling(window=9).min()
-    df['Tenkan'] = (high_9 + low_9) / 2
+    out['Tenkan'] = (highs[9] + lows[9]) / 2
 
     # 기준선 (26일)
-    high_26 = df['High'].rolling(window=26).max()
-    low_26 = df['Low'].rolling(window=26).min()
-    df['Kijun'] = (high_26 + low_26) / 2
+    out['Kijun'] = (highs[26] + lows[26]) / 2
 
     # 선행스팬 A (전환선 + 기준선) / 2, 26일 앞으로
-    df['SpanA'] = ((df['Tenkan'] + df['Kijun']) / 2).shift(26)
+    out['SpanA'] = graph.shift((out['Tenkan'] + out['Kijun']) / 2, 26)
 
     # 선행스팬 B (52일 고가 + 저가) / 2, 26일 앞으로
-    high_52 = df['High'].rolling(window=52).max()
-    low_52 = df['Low'].rolling(window=52).min()
-    df['SpanB'] = ((high_52 + low_52) / 2).shift(26)
+    out['SpanB'] = graph.shift((highs[52] + lows[52]) / 2, 26)
 
     # 후행스팬 (현재 종가, 26일 뒤로)
-    df['Chikou'] = df['Close'].shift(-26)
+    out['Chikou'] = graph.shift(out['Close'], -26)
 
-    return df
+    return out
 
 
-def calculate_rsi(df, period=14):
-    """RSI (상대강도지수) 계산"""
-    delta = df['Close'].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-    rs = gain / loss
-    df['RSI'] = 100 - (100 / (1 + rs))
-    return df
+def calculate_rsi(df, period=14, smoothing=None, dtype=None):
+    """
+    RSI (상대강도지수) 계산
 
+    Args:
+        smoothing: 상승/하락폭 평활 방식 ("wilder", "ema", "sma", None이면 graph.get_smoothing())
+    """
+    smoothing = smoothing or graph.get_smoothing()
+    out = indicator_result(df, dtype=dtype or graph.get_dtype())
+    close = out['Close']
+    delta = close - graph.shift(close, 1)
+    if smoothing == "sma":
+        # 첫 봉의 변화량은 0으로 계산 (pandas where와 같음)
+        delta = np.nan_to_num(delta, nan=0.0)
+    gain = graph.smooth(np.maximum(delta, 0.0), period, smoothing)
+    loss = graph.smooth(np.maximum(-delta, 0.0), period, smoothing)
+    out['RSI'] = 100 - (100 / (1 + graph._divide(gain, loss)))
+    return out
 
-def calculate_macd(df, fast=12, slow=26, signal=9):
+
+def calculate_macd(df, fast=12, slow=26, signal=9, dtype=None):
     """MACD 계산"""
-    df['EMA12'] = df['Close'].ewm(span=fast, adjust=False).mean()
-    df['EMA26'] = df['Close'].ewm(span=slow, adjust=False).mean()
-    df['MACD'] = df['EMA12'] - df['EMA26']
-    df['MACD_Signal'] = df['MACD'].ewm(span=signal, adjust=False).mean()
-    df['MACD_Hist'] = df['MACD'] - df['MACD_Signal']
-    return df
+    out = indicator_result(df, dtype=dtype or graph.get_dtype())
+    out['EMA12'] = graph.ema(out['Close'], fast)
+    out['EMA26'] = graph.ema(out['Close'], slow)
+    out['MACD'] = out['EMA12'] - out['EMA26']
+    out['MACD_Signal'] = graph.ema(out['MACD'], signal)
+    out['MACD_Hist'] = out['MACD'] - out['MACD_Signal']
+    return out
 
 
-def calculate_bollinger(df, period=20, std=2):
+def calculate_bollinger(df, period=20, std=2, dtype=None):
     """볼린저밴드 계산"""
-    df['BB_Middle'] = df['Close'].rolling(window=period).mean()
-    rolling_std = df['Close'].rolling(window=period).std()
-    df['BB_Upper'] = df['BB_Middle'] + (rolling_std * std)
-    df['BB_Lower'] = df['BB_Middle'] - (rolling_std * std)
-    df['BB_Width'] = (df['BB_Upper'] - df['BB_Lower']) / df['BB_Middle'] * 100
-    return df
+    out = indicator_result(df, dtype=dtype or graph.get_dtype())
+    out['BB_Middle'] = graph.rolling_mean(out['Close'], period)
+    rolling_std = graph.rolling_std(out['Close'], period)
+    out['BB_Upper'] = out['BB_Middle'] + (rolling_std * std)
+    out['BB_Lower'] = out['BB_Middle'] - (rolling_std * std)
+    out['BB_Width'] = (out['BB_Upper'] - out['BB_Lower']) / out['BB_Middle'] * 100
+    return out
 
 
-def calculate_atr(df, period=14):
-    """ATR (Average True Range) 변동성 지표"""
-    high = df['High']
-    low = df['Low']
-    close = df['Close']
+def calculate_atr(df, period=14, smoothing=None, dtype=None):
+    """
+    ATR (Average True Range) 변동성 지표
 
-    tr1 = high - low
-    tr2 = abs(high - close.shift())
-    tr3 = abs(low - close.shift())
+    Args:
+        smoothing: True Range 평활 방식 ("wilder", "ema", "sma", None이면 graph.get_smoothing())
+    """
+    out = indicator_result(df, dtype=dtype or graph.get_dtype())
+    high = out['High']
+    low = out['Low']
+    prev_close = graph.shift(out['Close'], 1)
 
-    tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-    df['ATR'] = tr.rolling(window=period).mean()
-    df['ATR_pct'] = df['ATR'] / df['Close'] * 100  # ATR을 %로
+    tr = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+    out['ATR'] = graph.smooth(tr, period, smoothing)
+    out['ATR_pct'] = out['ATR'] / out['Close'] * 100  # ATR을 %로
 
-    return df
+    return out
 
 
-def calculate_volume_analysis(df):
+def calculate_volume_analysis(df, dtype=None):
     """거래량 분석"""
-    df['Volume_MA20'] = df['Volume'].rolling(window=20).mean()
-    df['Volume_Ratio'] = df['Volume'] / df['Volume_MA20']
-    return df
+    out = indicator_result(df, dtype=dtype or graph.get_dtype())
+    out['Volume_MA20'] = graph.rolling_mean(out['Volume'], 20)
+    out['Volume_Ratio'] = graph._divide(out['Volume'], out['Volume_MA20'])
+    return out
 
 
 def calculate_momentum(df):
     """모멘텀 (수익률) 계산"""
+    df = as_frame(df)
     if df is None or len(df) < 5:
         return {}
 
@@ -134,14 +173,15 @@ def calculate_momentum(df):
 
 def calculate_support_resistance(df, window=20):
     """지지/저항선 계산"""
+    df = as_frame(df)
     if len(df) < window:
         return {}
 
     recent = df.tail(window)
 
     # 최근 고점/저점
-    resistance = recent['High'].max()
-    support = recent['Low'].min()
+    resistance = trailing_extrema(recent['High'], [window], "max")[window]
+    support = trailing_extrema(recent['Low'], [window], "min")[window]
 
     # 피봇 포인트
     pivot = (recent['High'].iloc[-1] + recent['Low'].iloc[-1] + recent['Close'].iloc[-1]) / 3
@@ -159,74 +199,60 @@ def calculate_support_resistance(df, window=20):
     }
 
 
-def detect_candle_patterns(df):
-    """캔들 패턴 감지"""
-    patterns = []
+# 마지막 봉 패턴 → 신호 문구 (순서대로 출력)
+CANDLE_MESSAGES = {
+    "doji": "✳️ 도지 (Doji) - 추세 전환 가능",
+    "hammer": "🔨 망치형 (Hammer) - 반등 신호",
+    "inverted_hammer": "🔨 역망치형 - 반등 가능",
+    "hanging_man": "☠️ 교수형 (Hanging Man) - 하락 전환 주의",
+    "bullish_engulfing": "📈 상승 장악형 (Bullish Engulfing) - 매수 신호",
+    "bearish_engulfing": "📉 하락 장악형 (Bearish Engulfing) - 매도 신호",
+    "morning_star": "⭐ 샛별형 (Morning Star) - 강한 반등 신호",
+}
 
+
+def detect_candle_patterns(df):
+    """캔들 패턴 감지 (마지막 봉, 전체 이력 스캔은 candle_patterns.scan_frame)"""
+    df = as_frame(df)
     if len(df) < 3:
-        return patterns
-
-    curr = df.iloc[-1]
-    prev = df.iloc[-2]
-    prev2 = df.iloc[-3]
-
-    open_p, high, low, close = curr['Open'], curr['High'], curr['Low'], curr['Close']
-    body = abs(close - open_p)
-    upper_shadow = high - max(open_p, close)
-    lower_shadow = min(open_p, close) - low
-    total_range = high - low
-
-    if total_range == 0:
-        return patterns
-
-    # 도지 (Doji) - 시가 = 종가
-    if body / total_range < 0.1:
-        patterns.append("✳️ 도지 (Doji) - 추세 전환 가능")
-
-    # 망치형 (Hammer) - 하락 추세에서 긴 아래꼬리
-    if lower_shadow > body * 2 and upper_shadow < body * 0.5 and close < prev['Close']:
-        patterns.append("🔨 망치형 (Hammer) - 반등 신호")
-
-    # 역망치형 (Inverted Hammer)
-    if upper_shadow > body * 2 and lower_shadow < body * 0.5 and close < prev['Close']:
-        patterns.append("🔨 역망치형 - 반등 가능")
-
-    # 교수형 (Hanging Man) - 상승 추세에서 긴 아래꼬리
-    if lower_shadow > body * 2 and upper_shadow < body * 0.5 and close > prev['Close']:
-        patterns.append("☠️ 교수형 (Hanging Man) - 하락 전환 주의")
-
-    # 장악형 (Engulfing)
-    prev_body = abs(prev['Close'] - prev['Open'])
-    if body > prev_body * 1.5:
-        if close > open_p and prev['Close'] < prev['Open']:  # 상승 장악형
-            patterns.append("📈 상승 장악형 (Bullish Engulfing) - 매수 신호")
-        elif close < open_p and prev['Close'] > prev['Open']:  # 하락 장악형
-            patterns.append("📉 하락 장악형 (Bearish Engulfing) - 매도 신호")
-
-    # 샛별형 (Morning Star) / 저녁별형 (Evening Star)
-    if len(df) >= 3:
-        # 3일 패턴 체크
-        day1_body = abs(prev2['Close'] - prev2['Open'])
-        day2_body = abs(prev['Close'] - prev['Open'])
-        day3_body = body
-
-        # 샛별형: 큰 음봉 → 작은 봉 → 큰 양봉
-        if (prev2['Close'] < prev2['Open'] and  # 1일차 음봉
-            day2_body < day1_body * 0.3 and     # 2일차 작은 봉
-            close > open_p and                   # 3일차 양봉
-            day3_body > day1_body * 0.5):
-            patterns.append("⭐ 샛별형 (Morning Star) - 강한 반등 신호")
-
-    return patterns
-
-
-def calculate_all_indicators(df):
-    """모든 기술적 지표 한번에 계산"""
-    df = calculate_ma(df)
-    df = calculate_ichimoku(df)
-    df = calculate_rsi(df)
-    df = calculate_macd(df)
-    df = calculate_bollinger(df)
-    df = calculate_volume_analysis(df)
-    df = calculate_atr(df)
-    return df
+        return []
+
+    recent = df.tail(3)
+    found = scan_candle_patterns(recent['Open'], recent['High'], recent['Low'], recent['Close'],
+                                 CANDLE_MESSAGES)
+    return [message for name, message in CANDLE_MESSAGES.items() if found[name][-1]]
+
+
+def calculate_all_indicators(df, tail=None, columns=None, dtype=None):
+    """
+    모든 기술적 지표 한번에 계산 (indicator_graph: 공유 중간값은 한 번만 계산)
+
+    Args:
+        df: OHLCV 데이터프레임
+        tail: 마지막 tail개 봉만 계산 (None이면 전체)
+              필요한 워밍업 구간만 잘라서 계산하므로 전체 계산과 같은 값
+              EMA(MACD)처럼 처음부터 누적되는 지표는 전체 종가로 계산 후 잘라냄
+        columns: 필요한 지표 컬럼만 계산 (None이면 INDICATOR_COLUMNS 전체)
+        dtype: 계산 dtype (None이면 indicator_graph dtype 정책)
+
+    Returns:
+        OHLCV + 지표 DataFrame (새로 생성, 원본 df는 수정하지 않음)
+        tail 모드는 마지막 tail개 봉만
+    """
+    df = as_frame(df)
+    columns = INDICATOR_COLUMNS if columns is None else list(columns)
+    dtype = dtype or graph.get_dtype()
+    base = {col: df[col].to_numpy(dtype=dtype) for col in BASE_COLUMNS}
+
+    if tail is None:
+        values = graph.compute(base, columns, dtype=dtype)
+        out = IndicatorResult(df, capacity=len(columns), dtype=dtype)
+        for col in columns:
+            out[col] = values[col]
+        return out.to_frame()
+
+    n = min(tail, len(df))
+    values = graph.compute(base, columns, tail=n, dtype=dtype)
+    out = {col: df[col].to_numpy()[len(df) - n:] for col in df.columns}
+    out.update(values)
+    return pd.DataFrame(out, index=df.index[len(df) - n:])
@@ -0,0 +1,78 @@
+"""
+종목 정보 캐시 모듈
+- 야후 ticker.info 응답을 종목별로 data/cache/info/ 에 저장
+- 용도별 유효기간(TTL) 적용 (펀더멘털 1일, 종목명/섹터/거래소 7일)
+"""
+
+import json
+import os
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+INFO_CACHE_DIR = os.path.join(BASE_DIR, "data", "cache", "info")
+
+# 유효기간 (초)
+FUNDAMENTALS_TTL = 24 * 3600
+METADATA_TTL = 7 * 24 * 3600
+
+
+def _info_path(symbol):
+    safe = "".join(c if c.isalnum() or c in "-." else "_" for c in symbol.upper())
+    return os.path.join(INFO_CACHE_DIR, f"{safe}.json")
+
+
+def load_info(symbol, max_age=None):
+    """
+    캐시된 info 로드
+
+    Args:
+        symbol: 심볼
+        max_age: 허용 경과 시간 (초, None이면 기간 무관)
+
+    Returns:
+        info dict 또는 None (없거나 만료)
+    """
+    path = _info_path(symbol)
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+    except Exception as e:
+        print(f"[{symbol}] 종목 정보 캐시 읽기 실패: {e}")
+        return None
+
+    if max_age is not None and time.time() - cached.get("fetched_at", 0) > max_age:
+        return None
+    return cached.get("info")
+
+
+def save_info(symbol, info):
+    """info 저장"""
+    os.makedirs(INFO_CACHE_DIR, exist_ok=True)
+    path = _info_path(symbol)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"fetched_at": time.time(), "info": info}, f, ensure_ascii=False, default=str)
+    os.replace(tmp_path, path)
+    return path
+
+
+def invalidate_info(symbol=None):
+    """
+    캐시 삭제
+
+    Args:
+        symbol: 삭제할 심볼 (None이면 전체)
+    """
+    if symbol is not None:
+        path = _info_path(symbol)
+        if os.path.exists(path):
+            os.remove(path)
+        return
+
+    if os.path.isdir(INFO_CACHE_DIR):
+        for name in os.listdir(INFO_CACHE_DIR):
+            if name.endswith(".json"):
+                os.remove(os.path.join(INFO_CACHE_DIR, name))
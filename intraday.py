@@ -0,0 +1,220 @@
+"""
+분봉(장중) 데이터 모듈
+- 종목별 고정 용량 링버퍼 (장시간 실행해도 메모리 일정)
+- 폴링 루프가 버퍼를 제자리에서 갱신
+- 분석 코드는 복사 없이 최근 봉 배열(view)을 읽음
+- 선택 시 종목별 스트리밍 지표(streaming.IndicatorSet)를 봉마다 갱신
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from streaming import IndicatorSet
+from yahoo_client import get_bulk_intraday_data, INTRADAY_INTERVALS
+
+# 종목당 보관할 최대 봉 수 (5분봉 기준 약 12거래일)
+RING_CAPACITY = 1000
+
+RING_FIELDS = ("open", "high", "low", "close", "volume")
+FRAME_COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+
+
+def to_epoch_seconds(index):
+    """DatetimeIndex → UTC epoch 초 (int64), 타임존 없는 인덱스는 UTC로 간주"""
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_convert("UTC").tz_localize(None)
+    return index.values.astype("datetime64[s]").astype(np.int64)
+
+
+class BarRingBuffer:
+    """
+    고정 용량 봉 링버퍼
+
+    저장 공간을 2배로 잡고 모든 봉을 두 위치에 함께 기록해서,
+    가장 최근 capacity개 봉이 항상 연속된 구간이 되도록 유지
+    → view()가 복사 없이 시간순 배열을 반환
+    """
+
+    __slots__ = ("capacity", "times", "open", "high", "low", "close", "volume", "_pos", "_count")
+
+    def __init__(self, capacity=RING_CAPACITY, dtype=np.float64):
+        self.capacity = capacity
+        self.times = np.zeros(2 * capacity, dtype=np.int64)
+        self.open = np.zeros(2 * capacity, dtype=dtype)
+        self.high = np.zeros(2 * capacity, dtype=dtype)
+        self.low = np.zeros(2 * capacity, dtype=dtype)
+        self.close = np.zeros(2 * capacity, dtype=dtype)
+        self.volume = np.zeros(2 * capacity, dtype=dtype)
+        self._pos = -1      # 마지막으로 기록한 위치 (0 ~ capacity-1)
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def last_time(self):
+        """마지막 봉 시각 (epoch 초, 없으면 None)"""
+        if self._count == 0:
+            return None
+        return int(self.times[self._pos])
+
+    def _write(self, pos, ts, o, h, l, c, v):
+        for i in (pos, pos + self.capacity):
+            self.times[i] = ts
+            self.open[i] = o
+            self.high[i] = h
+            self.low[i] = l
+            self.close[i] = c
+            self.volume[i] = v
+
+    def append(self, ts, o, h, l, c, v):
+        """
+        봉 추가
+        - 마지막 봉과 같은 시각이면 제자리 갱신 (진행 중인 봉)
+        - 마지막 봉보다 이전 시각이면 무시
+
+        Returns:
+            bool: 새 봉이 추가되었는지
+        """
+        last = self.last_time
+        if last is not None and ts < last:
+            return False
+        if last is not None and ts == last:
+            self._write(self._pos, ts, o, h, l, c, v)
+            return False
+
+        self._pos = (self._pos + 1) % self.capacity
+        self._write(self._pos, ts, o, h, l, c, v)
+        self._count = min(self._count + 1, self.capacity)
+        return True
+
+    def extend_frame(self, df):
+        """
+        DataFrame 봉들을 추가 (이미 있는 봉 이전 데이터는 건너뜀)
+
+        Returns:
+            int: 새로 추가된 봉 수
+        """
+        if df is None or len(df) == 0:
+            return 0
+        times = to_epoch_seconds(df.index)
+        columns = [df[col].to_numpy(dtype=np.float64) for col in FRAME_COLUMNS]
+
+        last = self.last_time
+        start = 0 if last is None else int(np.searchsorted(times, last, side="left"))
+
+        added = 0
+        for i in range(start, len(times)):
+            if np.isnan(columns[3][i]):
+                continue
+            added += self.append(times[i], *(col[i] for col in columns))
+        return added
+
+    def view(self, n=None):
+        """
+        최근 n개 봉 (시간순, 복사 없는 view)
+
+        Returns:
+            dict: {"time", "open", "high", "low", "close", "volume"}
+        """
+        n = self._count if n is None else min(n, self._count)
+        end = self._pos + self.capacity + 1
+        start = end - n
+        arrays = {"time": self.times[start:end]}
+        for field in RING_FIELDS:
+            arrays[field] = getattr(self, field)[start:end]
+        return arrays
+
+    def to_frame(self, n=None):
+        """최근 n개 봉 DataFrame (지표 계산용, 복사본)"""
+        arrays = self.view(n)
+        index = pd.DatetimeIndex(arrays["time"].astype("datetime64[s]"), name="Datetime")
+        return pd.DataFrame(
+            {col: arrays[field].copy() for col, field in zip(FRAME_COLUMNS, RING_FIELDS)},
+            index=index,
+        )
+
+
+class IntradayFeed:
+    """
+    분봉 폴링 피드
+    - 종목별 BarRingBuffer 유지
+    - poll() 한 번에 모든 종목을 일괄 요청해서 버퍼 갱신
+    - live_indicators=True면 종목별 지표도 새 봉만 반영해서 갱신 (전체 재계산 없음)
+    """
+
+    def __init__(self, symbols, interval="5m", capacity=RING_CAPACITY, warmup_period="5d",
+                 live_indicators=False):
+        if interval not in INTRADAY_INTERVALS:
+            raise ValueError(f"지원하지 않는 분봉 간격: {interval}")
+        self.symbols = list(dict.fromkeys(s.upper() for s in symbols))
+        self.interval = interval
+        self.warmup_period = warmup_period
+        self.buffers = {s: BarRingBuffer(capacity) for s in self.symbols}
+        self.indicators = {s: IndicatorSet() for s in self.symbols} if live_indicators else None
+        self._warmed_up = False
+
+    def get(self, symbol):
+        """종목 버퍼"""
+        return self.buffers.get(symbol.upper())
+
+    def latest_indicators(self, symbol):
+        """종목의 최신 지표 dict (live_indicators=False면 None)"""
+        if self.indicators is None:
+            return None
+        return self.indicators[symbol.upper()].value
+
+    def _update_indicators(self, symbol, df):
+        """마지막으로 반영한 봉(진행 중일 수 있음)부터 지표에 반영"""
+        if df is None or len(df) == 0:
+            return
+        state = self.indicators[symbol]
+        times = to_epoch_seconds(df.index)
+        columns = [df[col].to_numpy(dtype=np.float64) for col in FRAME_COLUMNS]
+
+        start = 0 if state.last_time is None else int(np.searchsorted(times, state.last_time, side="left"))
+        for i in range(start, len(times)):
+            if np.isnan(columns[3][i]):
+                continue
+            bar = {field: col[i] for field, col in zip(RING_FIELDS, columns)}
+            state.update(bar, time=int(times[i]))
+
+    def poll(self):
+        """
+        최신 분봉 받아서 버퍼 갱신
+
+        Returns:
+            dict: {심볼: 새로 추가된 봉 수}
+        """
+        period = "1d" if self._warmed_up else self.warmup_period
+        data = get_bulk_intraday_data(self.symbols, interval=self.interval, period=period)
+        self._warmed_up = self._warmed_up or bool(data)
+        added = {}
+        for s in self.symbols:
+            added[s] = self.buffers[s].extend_frame(data.get(s))
+            if self.indicators is not None:
+                self._update_indicators(s, data.get(s))
+        return added
+
+    def run(self, every=60, iterations=None, on_update=None):
+        """
+        폴링 루프
+
+        Args:
+            every: 폴링 간격 (초)
+            iterations: 반복 횟수 (None이면 무한)
+            on_update: 갱신 후 호출할 함수 on_update(feed, added)
+        """
+        count = 0
+        while iterations is None or count < iterations:
+            started = time.monotonic()
+            added = self.poll()
+            if on_update is not None:
+                on_update(self, added)
+            count += 1
+            if iterations is not None and count >= iterations:
+                break
+            time.sleep(max(0, every - (time.monotonic() - started)))
@@ -0,0 +1,133 @@
+"""
+OHLCV 배열 컨테이너 모듈
+- 컬럼별 연속 NumPy 배열 (struct-of-arrays)
+- int64 epoch day 인덱스
+- 슬라이싱은 복사 없이 view 반환
+- 대량 종목 스크리닝 시 DataFrame 대비 메모리 절약
+"""
+
+import numpy as np
+import pandas as pd
+
+from bar_store import to_epoch_days, from_epoch_days, load_bar_arrays
+
+# 가격/거래량 기본 dtype (종목당 메모리 절약)
+DEFAULT_DTYPE = np.float32
+
+OHLCV_FIELDS = ("open", "high", "low", "close", "volume")
+FRAME_COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+
+
+class OHLCV:
+    """
+    OHLCV 배열 묶음
+
+    Attributes:
+        days: epoch day (int64)
+        open, high, low, close, volume: 가격/거래량 배열
+        symbol: 심볼 (선택)
+    """
+
+    __slots__ = ("days", "open", "high", "low", "close", "volume", "symbol")
+
+    def __init__(self, days, open, high, low, close, volume, symbol=None, dtype=DEFAULT_DTYPE):
+        self.days = np.ascontiguousarray(days, dtype=np.int64)
+        self.open = np.ascontiguousarray(open, dtype=dtype)
+        self.high = np.ascontiguousarray(high, dtype=dtype)
+        self.low = np.ascontiguousarray(low, dtype=dtype)
+        self.close = np.ascontiguousarray(close, dtype=dtype)
+        self.volume = np.ascontiguousarray(volume, dtype=dtype)
+        self.symbol = symbol
+
+    @classmethod
+    def from_frame(cls, df, symbol=None, dtype=DEFAULT_DTYPE):
+        """yfinance DataFrame → OHLCV"""
+        return cls(
+            to_epoch_days(df.index),
+            *(df[col].to_numpy(dtype=dtype) for col in FRAME_COLUMNS),
+            symbol=symbol,
+            dtype=dtype,
+        )
+
+    @classmethod
+    def _view(cls, days, arrays, symbol):
+        """배열을 복사하지 않고 감싸기 (슬라이싱용)"""
+        obj = cls.__new__(cls)
+        obj.days = days
+        obj.open, obj.high, obj.low, obj.close, obj.volume = arrays
+        obj.symbol = symbol
+        return obj
+
+    def to_frame(self, dtype=np.float64):
+        """OHLCV → DataFrame (지표 계산용, 기본 float64)"""
+        df = pd.DataFrame(
+            {col: getattr(self, field).astype(dtype, copy=False)
+             for col, field in zip(FRAME_COLUMNS, OHLCV_FIELDS)},
+            index=self.index,
+        )
+        return df
+
+    @property
+    def index(self):
+        index = from_epoch_days(self.days)
+        index.name = "Date"
+        return index
+
+    @property
+    def dtype(self):
+        return self.close.dtype
+
+    @property
+    def nbytes(self):
+        return self.days.nbytes + sum(getattr(self, f).nbytes for f in OHLCV_FIELDS)
+
+    def __len__(self):
+        return len(self.days)
+
+    def __getitem__(self, key):
+        """
+        슬라이스 → OHLCV view (복사 없음)
+        정수 → 해당 봉 dict
+        """
+        if isinstance(key, slice):
+            return OHLCV._view(
+                self.days[key],
+                tuple(getattr(self, f)[key] for f in OHLCV_FIELDS),
+                self.symbol,
+            )
+        bar = {f: getattr(self, f)[key].item() for f in OHLCV_FIELDS}
+        bar["day"] = int(self.days[key])
+        return bar
+
+    def tail(self, n):
+        """최근 n개 봉 (view)"""
+        return self[max(len(self) - n, 0):]
+
+    def __repr__(self):
+        if len(self) == 0:
+            return f"OHLCV({self.symbol}, empty)"
+        first, last = self.index[0].date(), self.index[-1].date()
+        return f"OHLCV({self.symbol}, {len(self)} bars, {first}~{last}, {self.dtype})"
+
+
+def load_ohlcv(symbol, dtype=DEFAULT_DTYPE):
+    """로컬 저장소(bar_store)의 일봉을 DataFrame 없이 바로 OHLCV로 로드"""
+    days, columns, _ = load_bar_arrays(symbol)
+    if days is None:
+        return None
+    return OHLCV(
+        days, *(columns[col] for col in FRAME_COLUMNS),
+        symbol=symbol, dtype=dtype,
+    )
+
+
+def as_frame(data):
+    """
+    지표 함수 입력 정규화
+    OHLCV, 분봉 링버퍼(intraday.BarRingBuffer) 등 to_frame()이 있는 컨테이너는 DataFrame으로 변환
+    """
+    if isinstance(data, OHLCV):
+        return data.to_frame()
+    if data is not None and not isinstance(data, (pd.DataFrame, pd.Series)) and hasattr(data, "to_frame"):
+        return data.to_frame()
+    return data
@@ -0,0 +1,155 @@
+"""
+여러 종목 패널 지표 모듈
+- N개 종목을 (시간 × 종목) 행렬로 정렬
+- 지표를 종목별 DataFrame 루프 없이 행렬 연산 한 번으로 계산 (indicator_graph)
+- 종목마다 길이가 다른 이력은 NaN 마스크로 처리
+"""
+
+import numpy as np
+import pandas as pd
+
+import indicator_graph as graph
+from bar_store import to_epoch_days, from_epoch_days
+from indicators import INDICATOR_COLUMNS
+
+PANEL_FIELDS = ("open", "high", "low", "close", "volume")
+FRAME_COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+
+# 패딩 칸의 날짜
+MISSING_DAY = np.iinfo(np.int64).min
+
+
+class Panel:
+    """
+    (시간 × 종목) OHLCV 행렬
+
+    Attributes:
+        symbols: 종목 리스트 (열 순서)
+        days: 봉 날짜 (epoch day, 패딩은 MISSING_DAY)
+        open, high, low, close, volume: 가격/거래량 행렬 (기본 float64, 패딩은 NaN)
+        align: "bars" (종목별 최근 봉을 오른쪽 정렬) 또는 "dates" (같은 날짜끼리 정렬)
+    """
+
+    __slots__ = ("symbols", "days", "open", "high", "low", "close", "volume", "align")
+
+    def __init__(self, symbols, days, open, high, low, close, volume, align):
+        self.symbols = list(symbols)
+        self.days = days
+        self.open, self.high, self.low, self.close, self.volume = open, high, low, close, volume
+        self.align = align
+
+    @property
+    def shape(self):
+        return self.close.shape
+
+    def column(self, symbol):
+        return self.symbols.index(symbol)
+
+    def __repr__(self):
+        return f"Panel({len(self.symbols)} symbols, {self.shape[0]} bars, align={self.align})"
+
+
+def build_panel(frames, align="bars", length=None, dtype=None):
+    """
+    종목별 DataFrame → Panel
+
+    Args:
+        frames: {심볼: OHLCV DataFrame}
+        align: "bars"  - 종목별 최근 봉을 맨 아래에 맞춤 (종목별 지표가 단독 계산과 같음)
+               "dates" - 전체 날짜 합집합 기준 정렬, 상장 이후 빠진 날(휴장일)은 전날 종가로 채움
+        length: 최근 length개 행만 사용 (None이면 전체)
+        dtype: 행렬 dtype (None이면 indicator_graph dtype 정책, float32면 메모리/대역폭 절반)
+    """
+    if align not in ("bars", "dates"):
+        raise ValueError(f"지원하지 않는 정렬 방식: {align}")
+
+    dtype = dtype or graph.get_dtype()
+    frames = {s: df for s, df in frames.items() if df is not None and len(df) > 0}
+    symbols = list(frames)
+    if not symbols:
+        empty = np.empty((0, 0), dtype=dtype)
+        return Panel([], np.empty((0, 0), dtype=np.int64), *(empty,) * 5, align)
+
+    day_lists = {s: to_epoch_days(df.index) for s, df in frames.items()}
+    if align == "bars":
+        rows = max(len(d) for d in day_lists.values())
+    else:
+        calendar = np.unique(np.concatenate(list(day_lists.values())))
+        rows = len(calendar)
+    if length is not None:
+        rows = min(rows, length)
+
+    n = len(symbols)
+    days = np.full((rows, n), MISSING_DAY, dtype=np.int64)
+    arrays = {field: np.full((rows, n), np.nan, dtype=dtype) for field in PANEL_FIELDS}
+
+    for j, symbol in enumerate(symbols):
+        df = frames[symbol]
+        values = [df[col].to_numpy(dtype=np.float64) for col in FRAME_COLUMNS]
+        symbol_days = day_lists[symbol]
+
+        if align == "bars":
+            k = min(rows, len(symbol_days))
+            days[rows - k:, j] = symbol_days[-k:]
+            for field, v in zip(PANEL_FIELDS, values):
+                arrays[field][rows - k:, j] = v[-k:]
+            continue
+
+        cal = calendar[-rows:]
+        days[:, j] = cal
+        pos = np.searchsorted(symbol_days, cal, side="right") - 1
+        listed = pos >= 0
+        exact = listed & (symbol_days[np.maximum(pos, 0)] == cal)
+        close = values[3]
+        for field, v in zip(PANEL_FIELDS, values):
+            if field == "volume":
+                col = np.where(exact, v[np.maximum(pos, 0)], 0.0)
+            elif field == "close":
+                col = close[np.maximum(pos, 0)]
+            else:
+                # 빠진 날은 시/고/저가도 전날 종가
+                col = np.where(exact, v[np.maximum(pos, 0)], close[np.maximum(pos, 0)])
+            arrays[field][:, j] = np.where(listed, col, np.nan)
+
+    return Panel(symbols, days, *(arrays[f] for f in PANEL_FIELDS), align)
+
+
+def compute_panel_indicators(panel, columns=None, dtype=None):
+    """
+    패널 전체 지표 계산 (indicator_graph 사용, calculate_all_indicators와 같은 정의/컬럼명)
+
+    Args:
+        columns: 필요한 지표만 계산 (None이면 INDICATOR_COLUMNS 전체)
+        dtype: 계산 dtype (None이면 패널 행렬 dtype)
+
+    Returns:
+        dict: {지표명: (시간 × 종목) 행렬}
+    """
+    columns = INDICATOR_COLUMNS if columns is None else list(columns)
+    base = dict(zip(FRAME_COLUMNS, (getattr(panel, f) for f in PANEL_FIELDS)))
+    return graph.compute(base, columns, dtype=dtype or panel.close.dtype.type)
+
+
+def panel_tail(panel, indicators, tail=2):
+    """
+    종목별 마지막 tail개 봉의 지표 DataFrame
+    (calculate_all_indicators(df, tail=tail)과 같은 형태)
+
+    Returns:
+        dict: {심볼: DataFrame}
+    """
+    names = [c for c in INDICATOR_COLUMNS if c in indicators]
+    fields = dict(zip(FRAME_COLUMNS, PANEL_FIELDS))
+    frames = {}
+    for j, symbol in enumerate(panel.symbols):
+        rows = np.flatnonzero(~np.isnan(panel.close[:, j]) & (panel.days[:, j] != MISSING_DAY))[-tail:]
+        data = {col: getattr(panel, field)[rows, j] for col, field in fields.items()}
+        data.update({name: indicators[name][rows, j] for name in names})
+        frames[symbol] = pd.DataFrame(data, index=from_epoch_days(panel.days[rows, j]))
+    return frames
+
+
+def panel_indicator_frame(indicators, panel, name):
+    """지표 하나 → DataFrame (행: 봉, 열: 심볼, align="dates"일 때 날짜 인덱스)"""
+    index = from_epoch_days(panel.days[:, 0]) if panel.align == "dates" and panel.symbols else None
+    return pd.DataFrame(indicators[name], index=index, columns=panel.symbols)
@@ -0,0 +1,233 @@
+"""
+시세 제공자 모듈
+- MarketDataProvider: 시세/현재가/펀더멘털/환율 인터페이스
+- YahooProvider: 야후 파이낸스 (yfinance)
+- ReplayProvider: 녹화된 파일 재생 (네트워크 없이 결정적 실행/벤치마크용)
+- RecordingProvider: 다른 제공자 응답을 재생용 파일로 녹화
+"""
+
+import asyncio
+import json
+import os
+
+import pandas as pd
+import yfinance as yf
+
+from bar_store import BAR_COLUMNS, normalize_bars, period_start, slice_period
+from http_session import get_session
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(BASE_DIR, "data", "fixtures")
+
+
+def _safe_name(symbol):
+    return "".join(c if c.isalnum() or c in "-." else "_" for c in symbol.upper())
+
+
+def _history_path(fixtures_dir, symbol, interval="1d"):
+    """녹화 파일 경로 (일봉: {심볼}.csv, 분봉: {심볼}_{간격}.csv)"""
+    suffix = "" if interval == "1d" else f"_{interval}"
+    return os.path.join(fixtures_dir, f"{_safe_name(symbol)}{suffix}.csv")
+
+
+def to_utc_naive(df):
+    """분봉 인덱스를 UTC 기준 타임존 없는 시각으로 변환"""
+    df = df.copy()
+    index = pd.DatetimeIndex(df.index)
+    if index.tz is not None:
+        index = index.tz_convert("UTC").tz_localize(None)
+    df.index = index
+    return df
+
+
+class MarketDataProvider:
+    """시세 제공자 인터페이스"""
+
+    name = "base"
+    # 로컬 저장소(bar_store/info_cache)를 거칠지 여부
+    cacheable = True
+
+    def history(self, symbol, period=None, start=None, interval="1d"):
+        """일봉/분봉 OHLCV DataFrame"""
+        raise NotImplementedError
+
+    def bulk_history(self, symbols, period=None, start=None, interval="1d"):
+        """여러 종목 OHLCV → {심볼: DataFrame}"""
+        data = {}
+        for symbol in symbols:
+            df = self.history(symbol, period=period, start=start, interval=interval)
+            if df is not None and len(df) > 0:
+                data[symbol] = df
+        return data
+
+    def quote(self, symbol):
+        """현재가 (마지막 종가)"""
+        df = self.history(symbol, period="1d")
+        if df is None or len(df) == 0:
+            return None
+        return df['Close'].iloc[-1]
+
+    def info(self, symbol):
+        """종목 정보/펀더멘털 원본 (yfinance ticker.info 형식)"""
+        raise NotImplementedError
+
+    def fx_rate(self, base="USD", target="KRW"):
+        """환율"""
+        return self.quote(f"{base}{target}=X")
+
+    # === 비동기 버전 ===
+    # 기본 구현은 동기 메서드를 스레드에서 실행
+    # (네이티브 비동기 클라이언트가 있는 제공자는 재정의)
+
+    async def history_async(self, symbol, period=None, start=None, interval="1d"):
+        return await asyncio.to_thread(self.history, symbol, period, start, interval)
+
+    async def bulk_history_async(self, symbols, period=None, start=None, interval="1d"):
+        return await asyncio.to_thread(self.bulk_history, symbols, period, start, interval)
+
+    async def quote_async(self, symbol):
+        return await asyncio.to_thread(self.quote, symbol)
+
+    async def info_async(self, symbol):
+        return await asyncio.to_thread(self.info, symbol)
+
+    async def fx_rate_async(self, base="USD", target="KRW"):
+        return await asyncio.to_thread(self.fx_rate, base, target)
+
+
+class YahooProvider(MarketDataProvider):
+    """
+    야후 파이낸스 제공자
+    - 모든 요청이 공용 세션(http_session) 하나를 거침 (연결/쿠키 재사용)
+    """
+
+    name = "yahoo"
+
+    def __init__(self, session=None):
+        self._session = session
+
+    @property
+    def session(self):
+        """요청에 쓸 세션 (지정하지 않으면 프로세스 공용 세션)"""
+        return self._session if self._session is not None else get_session()
+
+    def history(self, symbol, period=None, start=None, interval="1d"):
+        ticker = yf.Ticker(symbol, session=self.session)
+        if start is not None:
+            return ticker.history(start=start, interval=interval)
+        return ticker.history(period=period, interval=interval)
+
+    def bulk_history(self, symbols, period=None, start=None, interval="1d"):
+        kwargs = {"start": start} if start is not None else {"period": period}
+        raw = yf.download(
+            symbols, interval=interval, group_by="ticker",
+            auto_adjust=True, actions=True, threads=True, progress=False,
+            session=self.session, **kwargs
+        )
+        if raw is None or raw.empty:
+            return {}
+
+        data = {}
+        for symbol in symbols:
+            if isinstance(raw.columns, pd.MultiIndex):
+                if symbol not in raw.columns.get_level_values(0):
+                    continue
+                df = raw[symbol]
+            else:
+                df = raw
+            # 거래일이 다른 종목(한국/코인)은 빈 행이 섞여 있으므로 제거
+            df = df.dropna(how="all")
+            if len(df) > 0:
+                data[symbol] = df.copy()
+        return data
+
+    def info(self, symbol):
+        return yf.Ticker(symbol, session=self.session).info
+
+
+class ReplayProvider(MarketDataProvider):
+    """
+    녹화 파일 재생 제공자
+    - {심볼}.csv: 일봉 OHLCV ({심볼}_{간격}.csv: 분봉, UTC)
+    - {심볼}.info.json: ticker.info
+
+    기간(period)은 녹화된 마지막 날짜 기준으로 자르므로 언제 실행해도 같은 결과
+    """
+
+    name = "replay"
+    cacheable = False
+
+    def __init__(self, fixtures_dir=FIXTURES_DIR):
+        self.fixtures_dir = fixtures_dir
+        self._frames = {}
+
+    def _load(self, symbol, interval="1d"):
+        key = (symbol, interval)
+        if key not in self._frames:
+            path = _history_path(self.fixtures_dir, symbol, interval)
+            if not os.path.exists(path):
+                self._frames[key] = None
+            else:
+                df = pd.read_csv(path, index_col=0, parse_dates=True)
+                df.index.name = "Date"
+                self._frames[key] = df
+        return self._frames[key]
+
+    def history(self, symbol, period=None, start=None, interval="1d"):
+        df = self._load(symbol, interval)
+        if df is None or len(df) == 0:
+            return pd.DataFrame(columns=BAR_COLUMNS)
+        if start is not None:
+            return df[df.index >= pd.Timestamp(start)].copy()
+        if period is not None:
+            return slice_period(df, period_start(period, today=df.index[-1])).copy()
+        return df.copy()
+
+    def info(self, symbol):
+        path = os.path.join(self.fixtures_dir, f"{_safe_name(symbol)}.info.json")
+        if not os.path.exists(path):
+            return {}
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+
+class RecordingProvider(MarketDataProvider):
+    """다른 제공자를 감싸서 응답을 ReplayProvider 형식으로 저장"""
+
+    name = "recording"
+
+    def __init__(self, provider, fixtures_dir=FIXTURES_DIR):
+        self.provider = provider
+        self.fixtures_dir = fixtures_dir
+        self.cacheable = provider.cacheable
+
+    def _record_history(self, symbol, df, interval="1d"):
+        if df is None or len(df) == 0:
+            return
+        os.makedirs(self.fixtures_dir, exist_ok=True)
+        path = _history_path(self.fixtures_dir, symbol, interval)
+        df = normalize_bars(df) if interval == "1d" else to_utc_naive(df)
+        if os.path.exists(path):
+            old = pd.read_csv(path, index_col=0, parse_dates=True)
+            df = pd.concat([old, df])
+            df = df[~df.index.duplicated(keep="last")].sort_index()
+        df.to_csv(path)
+
+    def history(self, symbol, period=None, start=None, interval="1d"):
+        df = self.provider.history(symbol, period=period, start=start, interval=interval)
+        self._record_history(symbol, df, interval)
+        return df
+
+    def bulk_history(self, symbols, period=None, start=None, interval="1d"):
+        data = self.provider.bulk_history(symbols, period=period, start=start, interval=interval)
+        for symbol, df in data.items():
+            self._record_history(symbol, df, interval)
+        return data
+
+    def info(self, symbol):
+        info = self.provider.info(symbol)
+        os.makedirs(self.fixtures_dir, exist_ok=True)
+        path = os.path.join(self.fixtures_dir, f"{_safe_name(symbol)}.info.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(info, f, ensure_ascii=False, default=str)
+        return info
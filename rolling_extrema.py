@@ -0,0 +1,180 @@
+"""
+이동 최댓값/최솟값 엔진
+- 배치: 스파스 테이블로 한 번 전처리 후 여러 창 크기를 각각 O(n)에 계산
+- 마지막 봉 기준 여러 기간 고점/저점: 역방향 누적 최댓값 한 번으로 계산
+- 스트리밍: 단조 덱 (봉당 상각 O(1)), 여러 창 크기를 덱 하나로 처리
+"""
+
+from bisect import bisect_right
+from collections import deque
+
+import numpy as np
+
+_OPS = {"max": np.maximum, "min": np.minimum}
+_SKIPNA_OPS = {"max": np.fmax, "min": np.fmin}
+
+
+def _sparse_table(values, op, max_window):
+    """levels[k][i] = op(values[i : i + 2**k])"""
+    levels = [values]
+    span = 1
+    while span * 2 <= max_window:
+        prev = levels[-1]
+        levels.append(op(prev[:-span], prev[span:]))
+        span *= 2
+    return levels
+
+
+def rolling_extrema(values, windows, kind="max"):
+    """
+    여러 창 크기의 이동 최댓값/최솟값 (pandas rolling(w).max()/min()과 같은 값)
+
+    Args:
+        values: 1차원 배열 또는 (시간 × 종목) 2차원 배열 (0번 축 기준, 창 안에 NaN이 있으면 NaN)
+                float32 입력은 float32로 계산
+        windows: 창 크기 (정수 또는 리스트)
+        kind: "max" 또는 "min"
+
+    Returns:
+        정수 windows → 배열, 리스트 → {창 크기: 배열}
+    """
+    op = _OPS[kind]
+    single = np.isscalar(windows)
+    window_list = [int(windows)] if single else [int(w) for w in windows]
+    values = np.asarray(values)
+    if values.dtype != np.float32:
+        values = values.astype(np.float64, copy=False)
+    n = len(values)
+
+    table = _sparse_table(values, op, min(max(window_list), max(n, 1)))
+    results = {}
+    for w in window_list:
+        out = np.full(values.shape, np.nan, dtype=values.dtype)
+        if 0 < w <= n:
+            k = w.bit_length() - 1
+            level = table[k]
+            span = 1 << k
+            # 창 [i-w+1, i] = [i-w+1, i-w+span] ∪ [i-span+1, i]
+            out[w - 1:] = op(level[:n - w + 1], level[w - span:n - span + 1])
+        results[w] = out
+    return results[window_list[0]] if single else results
+
+
+def centered_extrema(values, window, kind="max"):
+    """가운데 정렬 이동 최댓값/최솟값 (pandas rolling(window, center=True)와 같음)"""
+    trailing = rolling_extrema(values, window, kind)
+    # 가운데 창의 끝 = 현재 위치 + (window - 1) // 2
+    offset = (window - 1) // 2
+    out = np.full(len(trailing), np.nan)
+    if len(trailing) > offset:
+        out[:len(trailing) - offset] = trailing[offset:]
+    return out
+
+
+def trailing_extrema(values, windows, kind="max"):
+    """
+    마지막 봉 기준 최근 w개 봉의 최댓값/최솟값 (NaN 무시, Series.tail(w).max()와 같음)
+    역방향 누적 한 번으로 모든 기간을 계산
+
+    Returns:
+        {창 크기: 값} (데이터가 창보다 짧으면 전체 기간 값)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if len(values) == 0:
+        return {int(w): np.nan for w in windows}
+    acc = _SKIPNA_OPS[kind].accumulate(values[::-1])
+    return {int(w): float(acc[min(int(w), len(acc)) - 1]) for w in windows}
+
+
+class RollingExtremum:
+    """
+    스트리밍 이동 최댓값/최솟값 (단조 덱)
+    가장 큰 창 크기만큼 덱 하나를 유지하고 작은 창은 덱에서 이진 탐색
+
+    Args:
+        windows: 창 크기 (정수 또는 리스트)
+        kind: "max" 또는 "min"
+    """
+
+    def __init__(self, windows, kind="max"):
+        self.windows = [int(windows)] if np.isscalar(windows) else [int(w) for w in windows]
+        self.max_window = max(self.windows)
+        self.kind = kind
+        self.count = 0
+        self.positions = deque()   # 덱 원소의 봉 위치 (오름차순)
+        self.values = deque()      # 덱 원소 값 (max: 내림차순, min: 오름차순)
+        self.nan_at = None         # 마지막 NaN 위치 (창에 포함되면 NaN)
+        self.value = np.nan
+        # 마지막 update에서 앞/뒤로 뺀 (위치, 값)과 추가 여부 (rollback용)
+        self._removed = ([], [], False)
+
+    def update(self, x):
+        """
+        값 추가
+
+        Returns:
+            가장 작은 창 크기의 현재 값 (창이 다 차기 전에는 NaN)
+        """
+        i = self.count
+        self.count += 1
+        front = []
+        while self.positions and self.positions[0] <= i - self.max_window:
+            front.append((self.positions.popleft(), self.values.popleft()))
+
+        back = []
+        if x != x:
+            # NaN은 덱을 비워서 이후 창에 NaN이 섞였음을 표시
+            back = list(zip(self.positions, self.values))[::-1]
+            self.positions.clear()
+            self.values.clear()
+            self.nan_at = i
+        else:
+            if self.kind == "max":
+                while self.values and x >= self.values[-1]:
+                    back.append((self.positions.pop(), self.values.pop()))
+            else:
+                while self.values and x <= self.values[-1]:
+                    back.append((self.positions.pop(), self.values.pop()))
+            self.positions.append(i)
+            self.values.append(x)
+
+        self._removed = (front, back, x == x)
+        self.value = self.get(self.windows[0])
+        return self.value
+
+    def checkpoint(self):
+        """현재 상태 표시 (덱 복사 없음, rollback으로 이후 update 한 번 되돌리기)"""
+        return (self.count, self.nan_at, self.value)
+
+    def rollback(self, state):
+        """checkpoint() 이후 update 한 번 되돌리기 (뺀 원소만 다시 넣음, 상각 O(1))"""
+        count, nan_at, value = state
+        if self.count == count + 1:
+            front, back, appended = self._removed
+            if appended:
+                self.positions.pop()
+                self.values.pop()
+            for pos, v in reversed(back):
+                self.positions.append(pos)
+                self.values.append(v)
+            for pos, v in reversed(front):
+                self.positions.appendleft(pos)
+                self.values.appendleft(v)
+            self._removed = ([], [], False)
+        self.count, self.nan_at, self.value = count, nan_at, value
+        return self
+
+    def get(self, window):
+        """현재 봉 기준 최근 window개 봉의 값"""
+        i = self.count - 1
+        if self.count < window:
+            return np.nan
+        if self.nan_at is not None and i - self.nan_at < window:
+            return np.nan
+        # 창 시작 위치 이상인 첫 덱 원소
+        j = bisect_right(self.positions, i - window)
+        return self.values[j]
+
+    def values_by_window(self):
+        """{창 크기: 현재 값}"""
+        return {w: self.get(w) for w in self.windows}
@@ -6,8 +6,16 @@
 """
 
 
-def generate_trading_strategy(analysis, market_indicators):
-    """매매 전략 생성 (분할매수/매도, 손절선, 목표가)"""
+def generate_trading_strategy(analysis, market_indicators=None):
+    """
+    매매 전략 생성 (분할매수/매도, 손절선, 목표가)
+
+    Args:
+        analysis: analyze_signals() 결과
+        market_indicators: get_market_indicators() 스냅샷
+                           (analyze_portfolio에서 한 번 계산해 모든 종목이 공유)
+    """
+    market_indicators = market_indicators or {}
     strategy = {
         "action": "HOLD",
         "confidence": "MEDIUM",
@@ -0,0 +1,457 @@
+"""
+스트리밍 지표 모듈
+- 봉 하나가 들어올 때마다 O(1)로 갱신되는 지표 상태 객체
+  (SMA, EMA, 와일더 평균, MACD, RSI, 볼린저, ATR, 일목균형표, 거래량 비율)
+- 일목균형표 고가/저가는 rolling_extrema.RollingExtremum (단조 덱)
+- indicators.py의 calculate_* 와 같은 정의/같은 값
+- snapshot()/restore()로 상태 저장/복원 (파일 저장/프로세스 간 전달)
+- checkpoint()/rollback()으로 마지막 update 한 번 되돌리기 (장중 진행 중인 봉 다시 반영, 봉당 O(1))
+"""
+
+import math
+import pickle
+from collections import deque
+
+from indicator_graph import SMOOTHING_METHODS, get_smoothing
+from rolling_extrema import RollingExtremum
+
+# 누적합 오차가 쌓이지 않도록 주기적으로 창 전체 합을 다시 계산
+RESYNC_EVERY = 1024
+
+NAN = float("nan")
+
+
+def bar_values(bar):
+    """
+    봉 → (open, high, low, close, volume)
+    DataFrame 행(Open...), OHLCV/링버퍼 dict(open...) 모두 지원
+    """
+    try:
+        return (float(bar["Open"]), float(bar["High"]), float(bar["Low"]),
+                float(bar["Close"]), float(bar["Volume"]))
+    except KeyError:
+        return (float(bar["open"]), float(bar["high"]), float(bar["low"]),
+                float(bar["close"]), float(bar["volume"]))
+
+
+class StreamingIndicator:
+    """스트리밍 지표 기본 클래스"""
+
+    value = NAN
+
+    def update(self, x):
+        raise NotImplementedError
+
+    def snapshot(self):
+        """현재 상태 (bytes, 파일 저장/프로세스 간 전달 가능)"""
+        return pickle.dumps(self.__dict__, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def restore(self, state):
+        """snapshot() 상태로 되돌리기"""
+        self.__dict__.clear()
+        self.__dict__.update(pickle.loads(state))
+        return self
+
+    def checkpoint(self):
+        """
+        현재 상태 표시 (rollback으로 이후 update 한 번 되돌리기)
+        스칼라는 값, 하위 지표는 그 checkpoint, 덱/리스트는 복사 없이 길이만 기록
+        """
+        return {name: _mark(v) for name, v in self.__dict__.items()}
+
+    def rollback(self, state):
+        """checkpoint() 이후 update 한 번 되돌리기"""
+        for name, mark in state.items():
+            if isinstance(mark, _Mark):
+                mark.undo(self.__dict__[name])
+            else:
+                self.__dict__[name] = mark
+        return self
+
+
+class _Mark:
+    """하위 지표/덱/리스트의 checkpoint 기록 (제자리에서 되돌림)"""
+
+    __slots__ = ("state", "length", "evicted")
+
+    def __init__(self, state=None, length=0, evicted=None):
+        self.state, self.length, self.evicted = state, length, evicted
+
+    def undo(self, v):
+        if self.state is not None:
+            v.rollback(self.state)
+        elif isinstance(v, deque):
+            # update 한 번 = append 한 번 (가득 찬 maxlen 덱이면 맨 앞 원소가 밀려났으므로 되돌려 넣음)
+            if len(v) > self.length or self.evicted is not None:
+                v.pop()
+            if self.evicted is not None:
+                v.appendleft(self.evicted[0])
+        else:
+            del v[self.length:]
+
+
+def _mark(v):
+    if hasattr(v, "checkpoint"):
+        return _Mark(state=v.checkpoint())
+    if isinstance(v, deque):
+        full = v.maxlen is not None and len(v) == v.maxlen and len(v) > 0
+        return _Mark(length=len(v), evicted=(v[0],) if full else None)
+    if isinstance(v, list):
+        return _Mark(length=len(v))
+    return v
+
+
+class RollingSum(StreamingIndicator):
+    """고정 창 합계 (창이 다 차기 전이나 창 안에 NaN이 있으면 NaN, pandas rolling과 같음)"""
+
+    def __init__(self, window):
+        self.window = window
+        self.buffer = deque(maxlen=window)
+        self.total = 0.0
+        self.nan_count = 0
+        self.count = 0
+        self.value = NAN
+
+    def update(self, x):
+        if len(self.buffer) == self.window:
+            old = self.buffer[0]
+            if math.isnan(old):
+                self.nan_count -= 1
+            else:
+                self.total -= old
+        self.buffer.append(x)
+        if math.isnan(x):
+            self.nan_count += 1
+        else:
+            self.total += x
+        self.count += 1
+        if self.count % RESYNC_EVERY == 0:
+            self.total = math.fsum(v for v in self.buffer if not math.isnan(v))
+
+        full = len(self.buffer) == self.window and self.nan_count == 0
+        self.value = self.total if full else NAN
+        return self.value
+
+
+class SMA(StreamingIndicator):
+    """단순 이동평균"""
+
+    def __init__(self, window):
+        self.window = window
+        self._sum = RollingSum(window)
+        self.value = NAN
+
+    def update(self, x):
+        self.value = self._sum.update(x) / self.window
+        return self.value
+
+
+class EMA(StreamingIndicator):
+    """지수 이동평균 (pandas ewm(span, adjust=False)와 같음)"""
+
+    def __init__(self, span):
+        self.span = span
+        self.alpha = 2 / (span + 1)
+        self.value = NAN
+
+    def update(self, x):
+        if math.isnan(self.value):
+            self.value = x
+        elif not math.isnan(x):
+            self.value = self.alpha * x + (1 - self.alpha) * self.value
+        return self.value
+
+
+class WilderMA(StreamingIndicator):
+    """와일더 이동평균 (첫 period개 단순평균으로 시작, 이후 alpha = 1/period)"""
+
+    def __init__(self, period):
+        self.period = period
+        self.alpha = 1 / period
+        self.seed = []
+        self.value = NAN
+
+    def update(self, x):
+        if math.isnan(x):
+            return self.value
+        if len(self.seed) < self.period:
+            self.seed.append(x)
+            if len(self.seed) == self.period:
+                self.value = sum(self.seed) / self.period
+        else:
+            self.value = self.alpha * x + (1 - self.alpha) * self.value
+        return self.value
+
+
+def smoother(method, period):
+    """평활 방식별 스트리밍 평균 (indicator_graph.smooth와 같은 값)"""
+    if method == "wilder":
+        return WilderMA(period)
+    if method == "ema":
+        return EMA(period)
+    if method == "sma":
+        return SMA(period)
+    raise ValueError(f"지원하지 않는 평활 방식: {method} (가능: {', '.join(SMOOTHING_METHODS)})")
+
+
+class MACD(StreamingIndicator):
+    """MACD (EMA12 - EMA26, 시그널 9)"""
+
+    def __init__(self, fast=12, slow=26, signal=9):
+        self.fast = EMA(fast)
+        self.slow = EMA(slow)
+        self.signal = EMA(signal)
+        self.macd = NAN
+        self.hist = NAN
+        self.value = NAN
+
+    def update(self, close):
+        self.macd = self.fast.update(close) - self.slow.update(close)
+        signal = self.signal.update(self.macd)
+        self.hist = self.macd - signal
+        self.value = self.macd
+        return self.value
+
+    def values(self):
+        return {
+            "EMA12": self.fast.value,
+            "EMA26": self.slow.value,
+            "MACD": self.macd,
+            "MACD_Signal": self.signal.value,
+            "MACD_Hist": self.hist,
+        }
+
+
+class RSI(StreamingIndicator):
+    """RSI (상승/하락폭 평활, indicators.calculate_rsi와 같음)"""
+
+    def __init__(self, period=14, smoothing=None):
+        """smoothing: None이면 생성 시점의 indicator_graph.get_smoothing()"""
+        smoothing = smoothing or get_smoothing()
+        self.period = period
+        self.smoothing = smoothing
+        self.gain = smoother(smoothing, period)
+        self.loss = smoother(smoothing, period)
+        self.prev_close = NAN
+        self.value = NAN
+
+    def update(self, close):
+        delta = close - self.prev_close
+        self.prev_close = close
+        if math.isnan(delta) and self.smoothing == "sma":
+            # 첫 봉(변화량 없음)은 상승/하락 0으로 계산 (pandas where와 같음)
+            delta = 0.0
+        if math.isnan(delta):
+            # 와일더/지수 평활은 첫 봉 제외
+            gain = self.gain.update(NAN)
+            loss = self.loss.update(NAN)
+        else:
+            gain = self.gain.update(delta if delta > 0 else 0.0)
+            loss = self.loss.update(-delta if delta < 0 else 0.0)
+        if loss == 0:
+            self.value = 100.0 if gain > 0 else NAN
+        else:
+            self.value = 100 - (100 / (1 + gain / loss))
+        return self.value
+
+
+class Bollinger(StreamingIndicator):
+    """볼린저밴드 (표본 표준편차)"""
+
+    def __init__(self, period=20, num_std=2):
+        self.period = period
+        self.num_std = num_std
+        # 자릿수 손실을 줄이기 위해 첫 값 기준으로 이동한 합/제곱합 사용
+        self.shift = None
+        self._sum = RollingSum(period)
+        self._sumsq = RollingSum(period)
+        self.middle = self.upper = self.lower = self.width = NAN
+        self.value = NAN
+
+    def update(self, close):
+        if self.shift is None:
+            self.shift = close
+        d = close - self.shift
+        total = self._sum.update(d)
+        total_sq = self._sumsq.update(d * d)
+
+        n = self.period
+        mean = total / n
+        var = max((total_sq - total * mean) / (n - 1), 0.0) if n > 1 else NAN
+        std = math.sqrt(var) if not math.isnan(var) else NAN
+
+        self.middle = mean + self.shift
+        self.upper = self.middle + std * self.num_std
+        self.lower = self.middle - std * self.num_std
+        self.width = (self.upper - self.lower) / self.middle * 100 if self.middle else NAN
+        self.value = self.middle
+        return self.value
+
+    def values(self):
+        return {
+            "BB_Middle": self.middle,
+            "BB_Upper": self.upper,
+            "BB_Lower": self.lower,
+            "BB_Width": self.width,
+        }
+
+
+class ATR(StreamingIndicator):
+    """ATR (True Range 평활, indicators.calculate_atr와 같음)"""
+
+    def __init__(self, period=14, smoothing=None):
+        self.period = period
+        self.tr = smoother(smoothing or get_smoothing(), period)
+        self.prev_close = NAN
+        self.pct = NAN
+        self.value = NAN
+
+    def update(self, high, low, close):
+        tr = high - low
+        if not math.isnan(self.prev_close):
+            tr = max(tr, abs(high - self.prev_close), abs(low - self.prev_close))
+        self.prev_close = close
+        self.value = self.tr.update(tr)
+        self.pct = self.value / close * 100 if close else NAN
+        return self.value
+
+
+class Ichimoku(StreamingIndicator):
+    """
+    일목균형표 (전환선 9, 기준선 26, 선행스팬 26봉 선행)
+    후행스팬(Chikou)은 미래 종가가 필요하므로 스트리밍에서는 계산하지 않음
+    """
+
+    def __init__(self, tenkan=9, kijun=26, span_b=52, displacement=26):
+        self.displacement = displacement
+        self.periods = (tenkan, kijun, span_b)
+        # 세 기간을 고가/저가 덱 하나씩으로 처리
+        self.highs = RollingExtremum(self.periods, "max")
+        self.lows = RollingExtremum(self.periods, "min")
+        # 선행스팬은 displacement 봉 전 값 → 지연 버퍼
+        self.pending = deque(maxlen=displacement + 1)
+        self.tenkan = self.kijun = self.span_a = self.span_b = NAN
+        self.value = NAN
+
+    def update(self, high, low):
+        self.highs.update(high)
+        self.lows.update(low)
+        t, k, b = self.periods
+        self.tenkan = (self.highs.get(t) + self.lows.get(t)) / 2
+        self.kijun = (self.highs.get(k) + self.lows.get(k)) / 2
+        span_b = (self.highs.get(b) + self.lows.get(b)) / 2
+
+        self.pending.append(((self.tenkan + self.kijun) / 2, span_b))
+        if len(self.pending) > self.displacement:
+            self.span_a, self.span_b = self.pending[0]
+        self.value = self.tenkan
+        return self.value
+
+    def values(self):
+        return {
+            "Tenkan": self.tenkan,
+            "Kijun": self.kijun,
+            "SpanA": self.span_a,
+            "SpanB": self.span_b,
+        }
+
+
+class VolumeRatio(StreamingIndicator):
+    """거래량 / 20일 평균 거래량"""
+
+    def __init__(self, period=20):
+        self.ma = SMA(period)
+        self.value = NAN
+
+    def update(self, volume):
+        ma = self.ma.update(volume)
+        if ma == 0:
+            self.value = math.inf if volume > 0 else NAN
+        else:
+            self.value = volume / ma
+        return self.value
+
+
+class IndicatorSet(StreamingIndicator):
+    """
+    calculate_all_indicators()의 스트리밍 버전 (종목당 하나)
+
+    update(bar)는 마지막 봉 기준 지표 dict 반환 (컬럼명은 calculate_all_indicators와 같음)
+    같은 시각의 봉이 다시 들어오면 (장중 진행 중인 봉) 직전 상태로 되돌린 뒤 다시 반영
+    """
+
+    def __init__(self, ma_windows=(5, 20, 60), smoothing=None):
+        self.ma = {w: SMA(w) for w in ma_windows}
+        self.ichimoku = Ichimoku()
+        self.rsi = RSI(smoothing=smoothing)
+        self.macd = MACD()
+        self.bollinger = Bollinger()
+        self.volume = VolumeRatio()
+        self.atr = ATR(smoothing=smoothing)
+        self.last_time = None
+        self.value = {}
+        self._before_last = None
+
+    def _apply(self, o, h, l, c, v):
+        values = {f"MA{w}": sma.update(c) for w, sma in self.ma.items()}
+        self.ichimoku.update(h, l)
+        values.update(self.ichimoku.values())
+        values["RSI"] = self.rsi.update(c)
+        self.macd.update(c)
+        values.update(self.macd.values())
+        self.bollinger.update(c)
+        values.update(self.bollinger.values())
+        values["Volume_Ratio"] = self.volume.update(v)
+        values["Volume_MA20"] = self.volume.ma.value
+        values["ATR"] = self.atr.update(h, l, c)
+        values["ATR_pct"] = self.atr.pct
+        return values
+
+    def update(self, bar, time=None):
+        """
+        봉 반영
+
+        Args:
+            bar: 봉 (DataFrame 행 또는 open/high/low/close/volume dict)
+            time: 봉 시각 (지정하면 같은 시각 봉은 덮어쓰고, 이전 시각 봉은 무시)
+        """
+        if time is not None and self.last_time is not None:
+            if time < self.last_time:
+                return self.value
+            if time == self.last_time and self._before_last is not None:
+                # 같은 봉 다시 반영: 직전 update만 되돌림 (체크포인트는 그대로 재사용)
+                self._rollback_indicators(self._before_last)
+        if time is None:
+            self._before_last = None
+        elif self.last_time is None or time > self.last_time:
+            # 새 봉일 때만 체크포인트
+            self._before_last = self._checkpoint_indicators()
+
+        self.value = self._apply(*bar_values(bar))
+        self.last_time = time
+        return self.value
+
+    def _indicators(self):
+        return [*self.ma.values(), self.ichimoku, self.rsi, self.macd, self.bollinger, self.volume, self.atr]
+
+    def _checkpoint_indicators(self):
+        return [ind.checkpoint() for ind in self._indicators()]
+
+    def _rollback_indicators(self, state):
+        for ind, saved in zip(self._indicators(), state):
+            ind.rollback(saved)
+
+    @classmethod
+    def from_frame(cls, df, **kwargs):
+        """과거 봉으로 워밍업한 상태 생성"""
+        state = cls(**kwargs)
+        columns = [df[col].to_numpy(dtype=float) for col in ("Open", "High", "Low", "Close", "Volume")]
+        bars = list(zip(*columns))
+        for bar in bars[:-1]:
+            state._apply(*bar)
+        if bars:
+            # 마지막 봉은 장중 진행 중일 수 있으므로 반영 전 상태 보관
+            state._before_last = state._checkpoint_indicators()
+            state.value = state._apply(*bars[-1])
+            state.last_time = df.index[-1]
+        return state
@@ -0,0 +1,326 @@
+"""
+다중 기간 지표 스윕 모듈
+- SMA/EMA/RSI/볼린저를 수십 개 기간에 대해 한 번에 계산 → (기간 × 시간 × 종목) 텐서
+  - SMA/볼린저: 누적합 한 번 (기간마다 차분만)
+  - EMA/와일더 RSI: 기간들을 열로 나란히 놓고 재귀 필터 한 번
+- 골든/데드크로스, RSI 구간 신호와 신호 후 수익률 집계
+  (analyze_signals의 MA5/MA20 골든크로스, RSI 30/70 기준 튜닝용)
+
+입력은 1차원(종목 하나) 또는 (시간 × 종목) 배열 (panel.Panel 행렬 그대로)
+1차원 입력이면 결과는 (기간 × 시간)
+보정된 데이터 기준: 열마다 첫 유효값 이후 NaN이 없어야 함
+"""
+
+import numpy as np
+
+import indicator_graph as graph
+from indicator_graph import SMOOTHING_METHODS
+
+
+def _prepare(x, dtype):
+    x = np.asarray(x, dtype=np.float64)
+    single = x.ndim == 1
+    return (x[:, None] if single else x), single, dtype or graph.get_dtype()
+
+
+def _finish(out, single, dtype):
+    out = np.ascontiguousarray(out, dtype=dtype)
+    return out[:, :, 0] if single else out
+
+
+def _window_sums(x, windows):
+    """
+    기간별 이동 합계 (누적합 한 번, 창 안에 NaN이 있거나 창이 안 차면 NaN)
+    열마다 첫 유효값을 빼고 누적 (graph.rolling_sum과 같음)
+
+    Returns:
+        ([기간별 (창 - 1)번째 봉부터의 합 또는 None (창 > 봉 수)], 열별 기준값)
+    """
+    rows, cols = x.shape
+    valid = ~np.isnan(x)
+    base = graph._first_valid(x)
+    cs = np.zeros((rows + 1, cols))
+    np.cumsum(np.where(valid, x - base, 0.0), axis=0, out=cs[1:])
+    cnt = np.zeros((rows + 1, cols), dtype=np.int64)
+    np.cumsum(valid, axis=0, out=cnt[1:])
+
+    sums = []
+    for w in windows:
+        if w > rows:
+            sums.append(None)
+            continue
+        total = cs[w:] - cs[:-w]
+        full = (cnt[w:] - cnt[:-w]) == w
+        sums.append(np.where(full, total, np.nan))
+    return sums, base
+
+
+def _rolling_means(x, windows):
+    """기간별 이동평균 → (기간 × 시간 × 종목) float64"""
+    sums, base = _window_sums(x, windows)
+    out = np.full((len(windows),) + x.shape, np.nan)
+    for i, (w, total) in enumerate(zip(windows, sums)):
+        if total is not None:
+            out[i, w - 1:] = total / w + base
+    return out
+
+
+def sma_sweep(close, windows, dtype=None):
+    """
+    여러 기간 단순 이동평균
+
+    Args:
+        close: 종가 배열
+        windows: 기간 리스트
+
+    Returns:
+        (기간 × 시간 × 종목) 배열
+    """
+    x, single, dtype = _prepare(close, dtype)
+    return _finish(_rolling_means(x, [int(w) for w in windows]), single, dtype)
+
+
+def _filter_sweep(x, alphas, starts):
+    """기간별 재귀 필터를 (시간 × (기간·종목)) 행렬로 한 번에 계산 → (기간 × 시간 × 종목)"""
+    rows, cols = x.shape
+    n = len(alphas)
+    tiled = np.tile(x, (1, n))
+    y = graph.recursive_filter(tiled, np.repeat(alphas, cols), np.concatenate(starts))
+    return y.reshape(rows, n, cols).transpose(1, 0, 2)
+
+
+def ema_sweep(close, spans, dtype=None):
+    """
+    여러 기간 지수 이동평균 (pandas ewm(span, adjust=False)와 같음)
+
+    Returns:
+        (기간 × 시간 × 종목) 배열
+    """
+    x, single, dtype = _prepare(close, dtype)
+    spans = [int(s) for s in spans]
+    first = graph._first_valid_index(x)
+    out = _filter_sweep(x, np.array([2 / (s + 1) for s in spans]), [first] * len(spans))
+    return _finish(out, single, dtype)
+
+
+def _smoothed_sweep(x, periods, method):
+    """여러 기간 평활 (graph.smooth와 같은 값) → (기간 × 시간 × 종목)"""
+    if method == "sma":
+        return _rolling_means(x, periods)
+
+    first = graph._first_valid_index(x)
+    if method == "ema":
+        return _filter_sweep(x, np.array([2 / (p + 1) for p in periods]), [first] * len(periods))
+
+    # 와일더: 기간마다 첫 p개 단순평균을 시작값으로
+    rows, cols = x.shape
+    cs = np.zeros((rows + 1, cols))
+    np.cumsum(np.nan_to_num(x), axis=0, out=cs[1:])
+    tiled = np.tile(x, (1, len(periods)))
+    starts = []
+    for i, p in enumerate(periods):
+        start = first + p - 1
+        live = np.flatnonzero(start < rows)
+        seed = (cs[start[live] + 1, live] - cs[first[live], live]) / p
+        tiled[start[live], i * cols + live] = seed
+        starts.append(start)
+    y = graph.recursive_filter(tiled, np.repeat([1 / p for p in periods], cols), np.concatenate(starts))
+    return y.reshape(rows, len(periods), cols).transpose(1, 0, 2)
+
+
+def rsi_sweep(close, periods, smoothing=None, dtype=None):
+    """
+    여러 기간 RSI (indicators.calculate_rsi와 같은 값)
+
+    Args:
+        close: 종가 배열
+        periods: 기간 리스트
+        smoothing: "wilder", "ema", "sma" (None이면 graph.get_smoothing(), analyze_signals의 RSI와 같음)
+
+    Returns:
+        (기간 × 시간 × 종목) 배열
+    """
+    smoothing = smoothing or graph.get_smoothing()
+    if smoothing not in SMOOTHING_METHODS:
+        raise ValueError(f"지원하지 않는 평활 방식: {smoothing} (가능: {', '.join(SMOOTHING_METHODS)})")
+    x, single, dtype = _prepare(close, dtype)
+    periods = [int(p) for p in periods]
+
+    delta = x - graph.shift(x, 1)
+    if smoothing == "sma":
+        # 첫 봉의 변화량은 0으로 계산 (calculate_rsi와 같음)
+        delta = np.nan_to_num(delta, nan=0.0)
+    gain = _smoothed_sweep(np.maximum(delta, 0.0), periods, smoothing)
+    loss = _smoothed_sweep(np.maximum(-delta, 0.0), periods, smoothing)
+    out = 100 - (100 / (1 + graph._divide(gain, loss)))
+    return _finish(out, single, dtype)
+
+
+def bollinger_sweep(close, windows, num_std=2, dtype=None):
+    """
+    여러 기간 볼린저밴드 (누적합/제곱 누적합 한 번)
+
+    Returns:
+        dict: {"middle", "upper", "lower", "width": (기간 × 시간 × 종목) 배열}
+    """
+    x, single, dtype = _prepare(close, dtype)
+    windows = [int(w) for w in windows]
+    base = graph._first_valid(x)
+    d = x - base
+    s1, _ = _window_sums(d, windows)
+    s2, _ = _window_sums(d * d, windows)
+
+    middle = np.full((len(windows),) + x.shape, np.nan)
+    std = np.full_like(middle, np.nan)
+    for i, w in enumerate(windows):
+        if s1[i] is None:
+            continue
+        middle[i, w - 1:] = s1[i] / w + base
+        var = (s2[i] - s1[i] * s1[i] / w) / (w - 1)
+        std[i, w - 1:] = np.sqrt(np.maximum(var, 0.0))
+
+    upper = middle + std * num_std
+    lower = middle - std * num_std
+    width = (upper - lower) / middle * 100
+    return {name: _finish(v, single, dtype)
+            for name, v in (("middle", middle), ("upper", upper), ("lower", lower), ("width", width))}
+
+
+# === 신호 ===
+
+def _previous(x, axis):
+    """시간축으로 한 봉 전 값"""
+    out = np.full(x.shape, np.nan)
+    src = [slice(None)] * x.ndim
+    dst = [slice(None)] * x.ndim
+    src[axis], dst[axis] = slice(None, -1), slice(1, None)
+    out[tuple(dst)] = x[tuple(src)]
+    return out
+
+
+def cross_signals(fast, slow, axis=-2):
+    """
+    골든/데드크로스 (analyze_signals와 같은 기준: 전 봉 fast <= slow → 현재 fast > slow)
+
+    Args:
+        fast, slow: 같은 모양으로 브로드캐스트되는 배열
+                    예) sma[:, None] vs sma[None, :] → (빠른 기간 × 느린 기간 × 시간 × 종목)
+        axis: 시간축 (기본: 뒤에서 두 번째, 1차원 종가로 만든 스윕이면 -1)
+
+    Returns:
+        (golden, death) 불리언 배열
+    """
+    fast, slow = np.broadcast_arrays(fast, slow)
+    prev_fast, prev_slow = _previous(fast, axis), _previous(slow, axis)
+    golden = (prev_fast <= prev_slow) & (fast > slow)
+    death = (prev_fast >= prev_slow) & (fast < slow)
+    return golden, death
+
+
+def golden_cross_grid(close, fast_windows, slow_windows, dtype=None):
+    """
+    이평선 골든/데드크로스 그리드 (SMA 스윕 한 번으로 모든 조합)
+
+    Returns:
+        (golden, death): (빠른 기간 × 느린 기간 × 시간 × 종목) 불리언 배열 (1차원 종가면 종목 축 없음)
+    """
+    windows = sorted(set(fast_windows) | set(slow_windows))
+    sma = sma_sweep(close, windows, dtype)
+    axis = -1 if sma.ndim == 2 else -2
+    pos = {w: i for i, w in enumerate(windows)}
+    fast = sma[[pos[w] for w in fast_windows]]
+    slow = sma[[pos[w] for w in slow_windows]]
+    return cross_signals(fast[:, None], slow[None, :], axis)
+
+
+def rsi_zone_signals(rsi, lower=30, upper=70):
+    """
+    RSI 구간 신호 (analyze_signals와 같은 기준: RSI <= lower 과매도, RSI >= upper 과매수)
+    lower/upper에 배열을 주면 기준값 그리드로 브로드캐스트 (예: lower=np.array([20, 25, 30])[:, None, None, None])
+
+    Returns:
+        (oversold, overbought) 불리언 배열
+    """
+    return rsi <= lower, rsi >= upper
+
+
+def signal_returns(signals, close, horizon=5):
+    """
+    신호 발생 후 horizon봉 수익률 집계 (시간/종목 축으로 합산)
+
+    Args:
+        signals: 불리언 배열 (마지막 두 축 = 시간 × 종목, 1차원 종가면 마지막 축 = 시간)
+        close: 종가 배열 (시간 × 종목 또는 시간)
+        horizon: 보유 봉 수
+
+    Returns:
+        dict: {"count": 신호 수, "mean_return": 평균 수익률(%), "hit_rate": 수익 비율(%)}
+              각각 signals의 앞쪽 축 모양 (그리드별 값)
+    """
+    close = np.asarray(close, dtype=np.float64)
+    forward = (graph.shift(close, -horizon) / close - 1) * 100
+    axes = tuple(range(signals.ndim - close.ndim, signals.ndim))
+    hit = signals & ~np.isnan(forward)
+    returns = np.where(hit, forward, 0.0)
+
+    count = hit.sum(axis=axes)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_return = returns.sum(axis=axes) / count
+        hit_rate = (hit & (forward > 0)).sum(axis=axes) / count * 100
+    return {"count": count, "mean_return": mean_return, "hit_rate": hit_rate}
+
+
+# === 검증 ===
+
+SWEEP_TOLERANCE = 1e-9
+
+
+def compare_sweep(close, windows, smoothing=None, tolerance=SWEEP_TOLERANCE):
+    """
+    스윕 결과와 기간별 단독 계산(graph.rolling_mean/ema/smooth) 비교
+    짧은 기간과 긴 기간을 섞어서 주면 재귀 필터 블록 크기(가장 빠른 감쇠 기준)까지 검증됨
+
+    Args:
+        close: 종가 배열
+        windows: 기간 리스트 (예: range(2, 201))
+        smoothing: RSI 평활 방식 (None이면 graph.get_smoothing())
+        tolerance: 허용 오차 (최대 절댓값 대비)
+
+    Returns:
+        (ok, {"sma" | "ema" | "rsi": 최대 상대 오차})
+        NaN 위치가 다르거나 inf가 있으면 그 항목 오차는 inf
+    """
+    x = np.asarray(close, dtype=np.float64)
+    x2 = x[:, None] if x.ndim == 1 else x
+    windows = [int(w) for w in windows]
+    smoothing = smoothing or graph.get_smoothing()
+
+    delta = x2 - graph.shift(x2, 1)
+    if smoothing == "sma":
+        delta = np.nan_to_num(delta, nan=0.0)
+
+    def single_rsi(p):
+        gain = graph.smooth(np.maximum(delta, 0.0), p, smoothing)
+        loss = graph.smooth(np.maximum(-delta, 0.0), p, smoothing)
+        return 100 - (100 / (1 + graph._divide(gain, loss)))
+
+    checks = {
+        "sma": (sma_sweep(x2, windows, np.float64), lambda w: graph.rolling_mean(x2, w)),
+        "ema": (ema_sweep(x2, windows, np.float64), lambda w: graph.ema(x2, w)),
+        "rsi": (rsi_sweep(x2, windows, smoothing, np.float64), single_rsi),
+    }
+    errors = {}
+    for name, (swept, single) in checks.items():
+        worst = 0.0
+        for i, w in enumerate(windows):
+            ref, val = single(w), swept[i]
+            if not np.array_equal(np.isnan(ref), np.isnan(val)) or np.isinf(val).any():
+                worst = np.inf
+                break
+            valid = ~np.isnan(ref)
+            if valid.any():
+                scale = np.abs(ref[valid]).max()
+                diff = np.abs(ref[valid] - val[valid]).max()
+                worst = max(worst, float(diff / scale) if scale > 0 else float(diff))
+        errors[name] = worst
+    return all(e <= tolerance for e in errors.values()), errors
@@ -2,14 +2,18 @@
 매매일지 관리
 - 매수/매도 기록
 - 수익률 계산
+- 원화 환산 (매매일 환율)
 - 거래 내역 조회
 """
 
 import json
+import math
 import os
 import sys
 from datetime import datetime
 
+from yahoo_client import get_exchange_rates
+
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_DIR = os.path.join(BASE_DIR, "data")
 TRADES_FILE = os.path.join(DATA_DIR, "trades.json")
@@ -116,6 +120,15 @@ def get_holdings_summary():
 
         holdings[symbol]["trades"].append(t)
 
+    # 달러 거래는 매매일 환율로 원화 환산 (한 번에 조회)
+    usd_trades = [t for t in trades if not is_krw_symbol(t["symbol"])]
+    if usd_trades:
+        rates = get_exchange_rates([t["date"] for t in usd_trades])
+        for t, rate in zip(usd_trades, rates):
+            sign = 1 if t["type"] == "buy" else -1
+            cost_krw = holdings[t["symbol"]].get("total_cost_krw", 0)
+            holdings[t["symbol"]]["total_cost_krw"] = cost_krw + sign * t["total"] * rate
+
     print(f"\n{'='*60}")
     print(f"  보유 현황 (매매일지 기준)")
     print(f"{'='*60}")
@@ -127,10 +140,18 @@ def get_holdings_summary():
             print(f"  보유 수량: {data['quantity']}")
             print(f"  평균 단가: ${avg_price:.2f}")
             print(f"  총 투자금: ${data['total_cost']:.2f}")
+            cost_krw = data.get("total_cost_krw")
+            if cost_krw is not None and not math.isnan(cost_krw):
+                print(f"  원화 투자금 (매매일 환율): ₩{cost_krw:,.0f}")
 
     print(f"\n{'='*60}")
 
 
+def is_krw_symbol(symbol):
+    """원화 종목 여부 (한국 주식)"""
+    return symbol.upper().endswith((".KS", ".KQ"))
+
+
 def delete_trade(trade_id):
     """매매 기록 삭제"""
     data = load_trades()
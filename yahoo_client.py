@@ -1,12 +1,53 @@
 """
 야후 파이낸스 클라이언트 모듈
-- 주가 데이터 조회
+- 주가 데이터 조회 (로컬 저장소 + 증분 요청)
+- 분봉 데이터 조회 (1m/5m/15m)
+- 일별 환율 시계열 (날짜별 원화 환산)
+- 요청 속도 제한/재시도/동시 실행 (fetch_executor)
+- 종목 정보 캐시 (info_cache)
+- 시세 제공자 교체 (providers: 야후 / 녹화 재생)
+- asyncio 버전 (*_async)
 - 펀더멘털 데이터 조회
 - 시장 지표 조회
 - 레버리지 ETF 매핑
 """
 
-import yfinance as yf
+import asyncio
+
+import numpy as np
+import pandas as pd
+
+from bar_store import (
+    load_bars, save_bars, merge_bars, period_start, slice_period, to_epoch_days
+)
+from fetch_executor import get_executor, collect, RequestCoalescer
+from info_cache import (
+    load_info, save_info, invalidate_info, FUNDAMENTALS_TTL, METADATA_TTL
+)
+from providers import YahooProvider
+
+# 시장 지표 → 심볼
+MARKET_TICKERS = {
+    "vix": "^VIX",        # VIX (공포지수)
+    "spy": "SPY",         # S&P 500
+    "qqq": "QQQ",         # 나스닥
+    "us10y": "^TNX",      # 10년물 국채 금리
+    "dxy": "DX-Y.NYB",    # 달러 인덱스
+}
+MARKET_SYMBOLS = list(MARKET_TICKERS.values())
+
+# 전일 대비 등락률도 계산하는 지표
+MARKET_CHANGE_KEYS = {"vix", "spy", "qqq"}
+
+# 환율 시계열 보관 기간
+FX_HISTORY_PERIOD = "5y"
+
+# 분봉 간격 → 야후 최대 조회 기간
+INTRADAY_INTERVALS = {
+    "1m": "7d",
+    "5m": "60d",
+    "15m": "60d",
+}
 
 # 레버리지 ETF → 원본 매핑
 LEVERAGE_MAP = {
@@ -55,22 +96,235 @@ def is_leveraged(symbol):
     return symbol.upper() in LEVERAGE_MAP
 
 
+_provider = YahooProvider()
+
+# 같은 (심볼, 기간, 봉 간격) 요청은 한 번만 실행
+_coalescer = RequestCoalescer()
+
+
+def get_provider():
+    """현재 시세 제공자"""
+    return _provider
+
+
+def set_provider(provider):
+    """
+    시세 제공자 교체
+
+    Args:
+        provider: providers.MarketDataProvider 구현 (예: ReplayProvider())
+
+    Returns:
+        이전 제공자
+    """
+    global _provider
+    previous, _provider = _provider, provider
+    return previous
+
+
+def _fetch(fn, *args, **kwargs):
+    """야후 요청 1건 실행 (속도 제한 + 재시도)"""
+    return get_executor().call(fn, *args, **kwargs)
+
+
+def get_info(symbol, max_age=FUNDAMENTALS_TTL):
+    """
+    ticker.info 조회 (캐시가 max_age 이내면 요청 생략)
+    요청이 실패하면 만료된 캐시라도 반환
+    """
+    return _coalescer.get(("info", symbol.upper(), max_age), _load_info, symbol, max_age)
+
+
+def _load_info(symbol, max_age):
+    provider = get_provider()
+    if not provider.cacheable:
+        return _fetch(provider.info, symbol)
+
+    info = load_info(symbol, max_age)
+    if info is not None:
+        return info
+
+    try:
+        info = _fetch(provider.info, symbol)
+    except Exception:
+        info = load_info(symbol)
+        if info is None:
+            raise
+        print(f"[{symbol}] 저장된 종목 정보 사용")
+        return info
+
+    save_info(symbol, info)
+    return info
+
+
+def invalidate_ticker_info(symbol=None):
+    """종목 정보 캐시 삭제 (symbol이 None이면 전체)"""
+    invalidate_info(symbol)
+
+
+def submit_fetch(fn, *args, **kwargs):
+    """함수를 공용 실행기에 제출하고 Future 반환"""
+    return get_executor().submit(fn, *args, **kwargs)
+
+
+def fetch_many(fn, symbols, **kwargs):
+    """
+    여러 심볼에 대해 fn(symbol)을 동시에 실행
+
+    Returns:
+        dict: {심볼: 결과} (실패 시 None)
+    """
+    return collect(get_executor().submit_many(fn, symbols, **kwargs))
+
+
 def get_stock_data(symbol, period="3mo"):
-    """야후 파이낸스에서 주가 데이터 가져오기"""
+    """
+    야후 파이낸스에서 주가 데이터 가져오기
+    로컬 저장소(bar_store)를 먼저 읽고 마지막 저장일 이후 구간만 추가 요청
+    같은 심볼/기간을 동시에 또는 반복 요청하면 한 번만 받아서 공유
+    """
+    df = _coalescer.get((symbol.upper(), period, "1d"), _load_stock_data, symbol, period)
+    return df.copy() if df is not None else None
+
+
+def clear_request_cache():
+    """합쳐진 요청 결과 비우기 (다음 요청은 새로 실행)"""
+    _coalescer.clear()
+
+
+def _load_stock_data(symbol, period):
+    provider = get_provider()
+    if not provider.cacheable:
+        try:
+            return _fetch(provider.history, symbol, period=period)
+        except Exception as e:
+            print(f"[{symbol}] 데이터 가져오기 실패: {e}")
+            return None
+
+    start = period_start(period)
+    stored, covered_from = load_bars(symbol)
+
     try:
-        ticker = yf.Ticker(symbol)
-        df = ticker.history(period=period)
-        return df
+        if stored is not None and len(stored) > 0 and covered_from <= start:
+            # 마지막 봉부터 다시 받아서 장중 미완성 봉까지 갱신
+            last_date = stored.index[-1].strftime("%Y-%m-%d")
+            new = _fetch(provider.history, symbol, start=last_date)
+        else:
+            new = _fetch(provider.history, symbol, period=period)
+            covered_from = start if covered_from is None else min(covered_from, start)
     except Exception as e:
         print(f"[{symbol}] 데이터 가져오기 실패: {e}")
+        if stored is not None:
+            print(f"[{symbol}] 저장된 데이터 사용 (~{stored.index[-1].date()})")
+        return slice_period(stored, start)
+
+    df = merge_bars(stored, new)
+    if df is None or len(df) == 0:
+        return df
+    if new is not None and len(new) > 0:
+        save_bars(symbol, df, covered_from)
+    return slice_period(df, start)
+
+
+def _download(symbols, **kwargs):
+    """일괄 요청 → {심볼: DataFrame}"""
+    try:
+        return _fetch(get_provider().bulk_history, symbols, **kwargs)
+    except Exception as e:
+        print(f"일괄 데이터 가져오기 실패: {e}")
+        return {}
+
+
+def get_bulk_stock_data(symbols, period="1y"):
+    """
+    여러 종목 주가 데이터를 한 번의 요청으로 가져오기
+    저장된 종목은 마지막 저장일 이후 구간만 묶어서 요청
+
+    Args:
+        symbols: 심볼 리스트 (중복은 제거됨)
+        period: 조회 기간
+
+    Returns:
+        dict: {심볼: DataFrame} (실패한 심볼은 제외)
+    """
+    symbols = list(dict.fromkeys(s.upper() for s in symbols if s))
+    if not symbols:
+        return {}
+
+    if not get_provider().cacheable:
+        return _download(symbols, period=period)
+
+    start = period_start(period)
+    stored = {}
+    full_symbols = []
+    delta_symbols = []
+    for symbol in symbols:
+        df, covered_from = load_bars(symbol)
+        stored[symbol] = (df, covered_from)
+        if df is not None and len(df) > 0 and covered_from <= start:
+            delta_symbols.append(symbol)
+        else:
+            full_symbols.append(symbol)
+
+    fetched = {}
+    if full_symbols:
+        fetched.update(_download(full_symbols, period=period))
+    if delta_symbols:
+        last_date = min(stored[s][0].index[-1] for s in delta_symbols)
+        fetched.update(_download(delta_symbols, start=last_date.strftime("%Y-%m-%d")))
+
+    data = {}
+    for symbol in symbols:
+        df, covered_from = stored[symbol]
+        new = fetched.get(symbol)
+        if new is not None:
+            if symbol in full_symbols:
+                covered_from = start if covered_from is None else min(covered_from, start)
+            df = merge_bars(df, new)
+            save_bars(symbol, df, covered_from)
+        elif df is not None:
+            print(f"[{symbol}] 저장된 데이터 사용 (~{df.index[-1].date()})")
+        df = slice_period(df, start)
+        if df is not None and len(df) > 0:
+            data[symbol] = df
+
+    return data
+
+
+def _check_interval(interval):
+    if interval not in INTRADAY_INTERVALS:
+        raise ValueError(f"지원하지 않는 분봉 간격: {interval} (가능: {', '.join(INTRADAY_INTERVALS)})")
+
+
+def get_intraday_data(symbol, interval="5m", period="1d"):
+    """
+    분봉 데이터 가져오기 (로컬 저장소를 거치지 않음)
+
+    Args:
+        interval: "1m", "5m", "15m"
+        period: 조회 기간 (1m은 최대 7일, 5m/15m은 최대 60일)
+    """
+    _check_interval(interval)
+    try:
+        return _fetch(get_provider().history, symbol, period=period, interval=interval)
+    except Exception as e:
+        print(f"[{symbol}] 분봉 가져오기 실패: {e}")
         return None
 
 
+def get_bulk_intraday_data(symbols, interval="5m", period="1d"):
+    """여러 종목 분봉을 한 번의 요청으로 가져오기 → {심볼: DataFrame}"""
+    _check_interval(interval)
+    symbols = list(dict.fromkeys(s.upper() for s in symbols if s))
+    if not symbols:
+        return {}
+    return _download(symbols, period=period, interval=interval)
+
+
 def get_fundamentals(symbol):
     """펀더멘털 데이터 가져오기"""
     try:
-        ticker = yf.Ticker(symbol)
-        info = ticker.info
+        info = get_info(symbol, FUNDAMENTALS_TTL)
 
         return {
             "market_cap": info.get("marketCap"),
@@ -103,43 +357,29 @@ def get_fundamentals(symbol):
         return {}
 
 
-def get_market_indicators():
-    """시장 전체 지표 (VIX, 금리, 섹터 등)"""
+def get_market_indicators(data=None):
+    """
+    시장 전체 지표 (VIX, 금리, 섹터 등)
+
+    Args:
+        data: get_bulk_stock_data() 결과 (보유 종목과 같은 일괄 요청에서 받은 데이터)
+              빠진 시장 심볼만 한 번의 일괄 요청으로 추가로 받음
+    """
     indicators = {}
 
+    data = dict(data or {})
+    missing = [s for s in MARKET_SYMBOLS if data.get(s) is None]
+    if missing:
+        data.update(get_bulk_stock_data(missing, period="5d"))
+
     try:
-        # VIX (공포지수)
-        vix = yf.Ticker("^VIX")
-        vix_data = vix.history(period="5d")
-        if len(vix_data) > 0:
-            indicators["vix"] = round(vix_data['Close'].iloc[-1], 2)
-            indicators["vix_change"] = round(vix_data['Close'].pct_change().iloc[-1] * 100, 2)
-
-        # S&P 500
-        spy = yf.Ticker("SPY")
-        spy_data = spy.history(period="5d")
-        if len(spy_data) > 0:
-            indicators["spy"] = round(spy_data['Close'].iloc[-1], 2)
-            indicators["spy_change"] = round(spy_data['Close'].pct_change().iloc[-1] * 100, 2)
-
-        # 나스닥
-        qqq = yf.Ticker("QQQ")
-        qqq_data = qqq.history(period="5d")
-        if len(qqq_data) > 0:
-            indicators["qqq"] = round(qqq_data['Close'].iloc[-1], 2)
-            indicators["qqq_change"] = round(qqq_data['Close'].pct_change().iloc[-1] * 100, 2)
-
-        # 10년물 국채 금리
-        tlt = yf.Ticker("^TNX")
-        tlt_data = tlt.history(period="5d")
-        if len(tlt_data) > 0:
-            indicators["us10y"] = round(tlt_data['Close'].iloc[-1], 2)
-
-        # 달러 인덱스
-        dxy = yf.Ticker("DX-Y.NYB")
-        dxy_data = dxy.history(period="5d")
-        if len(dxy_data) > 0:
-            indicators["dxy"] = round(dxy_data['Close'].iloc[-1], 2)
+        for key, symbol in MARKET_TICKERS.items():
+            df = data.get(symbol)
+            if df is None or len(df) == 0:
+                continue
+            indicators[key] = round(df['Close'].iloc[-1], 2)
+            if key in MARKET_CHANGE_KEYS:
+                indicators[f"{key}_change"] = round(df['Close'].pct_change().iloc[-1] * 100, 2)
 
     except Exception as e:
         print(f"  시장 지표 가져오기 실패: {e}")
@@ -169,8 +409,7 @@ def get_market_indicators():
 def get_ticker_info(symbol):
     """종목 기본 정보 가져오기"""
     try:
-        ticker = yf.Ticker(symbol)
-        info = ticker.info
+        info = get_info(symbol, METADATA_TTL)
         return {
             "name": info.get("longName") or info.get("shortName"),
             "symbol": symbol,
@@ -185,25 +424,108 @@ def get_ticker_info(symbol):
 
 
 def get_exchange_rate(base="USD", target="KRW"):
-    """환율 가져오기"""
-    try:
-        symbol = f"{base}{target}=X"
-        ticker = yf.Ticker(symbol)
-        data = ticker.history(period="1d")
-        if len(data) > 0:
-            return round(data['Close'].iloc[-1], 2)
-    except Exception as e:
-        print(f"환율 가져오기 실패: {e}")
+    """환율 가져오기 (로컬에 쌓인 일별 환율의 최신값)"""
+    series = get_fx_series(base, target)
+    if series is not None and len(series) > 0:
+        return round(float(series.iloc[-1]), 2)
+    print(f"환율 가져오기 실패: {base}/{target}")
     return None
 
 
+def get_fx_series(base="USD", target="KRW", period=FX_HISTORY_PERIOD):
+    """
+    일별 환율 시계열 (종가)
+    주가와 같은 로컬 저장소를 사용하므로 마지막 저장일 이후만 추가 요청
+    """
+    df = get_stock_data(f"{base}{target}=X", period=period)
+    if df is None or len(df) == 0:
+        return None
+    return df['Close'].dropna()
+
+
+def get_exchange_rates(dates, base="USD", target="KRW", series=None):
+    """
+    날짜별 환율 (벡터화 조회)
+    각 날짜 당일 또는 그 이전 가장 최근 거래일 종가를 사용 (주말/휴일 대응)
+
+    Args:
+        dates: 날짜 리스트 (문자열/Timestamp/date)
+        series: get_fx_series() 결과 (없으면 조회)
+
+    Returns:
+        np.ndarray: 환율 (시계열 시작 이전 날짜는 NaN)
+    """
+    if series is None:
+        series = get_fx_series(base, target)
+    query = to_epoch_days(pd.to_datetime(list(dates)))
+    if series is None or len(series) == 0:
+        return np.full(len(query), np.nan)
+
+    days = to_epoch_days(series.index)
+    values = series.to_numpy(dtype=np.float64)
+    pos = np.searchsorted(days, query, side="right") - 1
+    rates = values[np.clip(pos, 0, None)]
+    rates[pos < 0] = np.nan
+    return rates
+
+
 def get_current_price(symbol):
     """현재가 가져오기"""
     try:
-        ticker = yf.Ticker(symbol)
-        data = ticker.history(period="1d")
-        if len(data) > 0:
-            return round(data['Close'].iloc[-1], 2)
+        price = _fetch(get_provider().quote, symbol)
+        if price is not None:
+            return round(price, 2)
     except Exception as e:
         print(f"[{symbol}] 현재가 실패: {e}")
     return None
+
+
+# === 비동기 버전 (asyncio) ===
+# 저장소/캐시/재시도를 거치는 요청은 스레드에서 실행하고,
+# 캐시를 쓰지 않는 제공자(녹화 재생 등)는 제공자의 비동기 메서드를 바로 사용
+
+async def get_stock_data_async(symbol, period="3mo"):
+    """get_stock_data 비동기 버전"""
+    provider = get_provider()
+    if provider.cacheable:
+        return await asyncio.to_thread(get_stock_data, symbol, period)
+    try:
+        return await provider.history_async(symbol, period=period)
+    except Exception as e:
+        print(f"[{symbol}] 데이터 가져오기 실패: {e}")
+        return None
+
+
+async def get_bulk_stock_data_async(symbols, period="1y"):
+    """get_bulk_stock_data 비동기 버전"""
+    provider = get_provider()
+    if provider.cacheable:
+        return await asyncio.to_thread(get_bulk_stock_data, symbols, period)
+    symbols = list(dict.fromkeys(s.upper() for s in symbols if s))
+    try:
+        return await provider.bulk_history_async(symbols, period=period)
+    except Exception as e:
+        print(f"일괄 데이터 가져오기 실패: {e}")
+        return {}
+
+
+async def get_fundamentals_async(symbol):
+    """get_fundamentals 비동기 버전"""
+    return await asyncio.to_thread(get_fundamentals, symbol)
+
+
+async def gather_fundamentals_async(symbols):
+    """
+    여러 종목 펀더멘털 동시 요청
+
+    Returns:
+        dict: {심볼: 펀더멘털}
+    """
+    symbols = list(dict.fromkeys(symbols))
+    results = await asyncio.gather(*(get_fundamentals_async(s) for s in symbols))
+    return dict(zip(symbols, results))
+
+
+async def get_exchange_rate_async(base="USD", target="KRW"):
+    """get_exchange_rate 비동기 버전"""
+    return await asyncio.to_thread(get_exchange_rate, base, target)